@@ -4,17 +4,41 @@ import plotly.express as px
 import plotly.graph_objects as go
 import matplotlib.pyplot as plt
 import seaborn as sns
-from wordcloud import WordCloud
 import numpy as np
+import functools
 import os
 import time
-import sqlite3
 from datetime import datetime
 from PIL import Image
 import requests
 from bs4 import BeautifulSoup
 import re
 from collections import Counter
+from seo_engine.aggregates import kpis, read_summary, summarize_frame
+from seo_engine.analytics import engine_for
+from seo_engine.batch import ingest_batch, parse_file
+from seo_engine.cache import cached_process, dataset_fingerprint
+from seo_engine.cloud import render_cloud, term_weights
+from seo_engine.datasets import dataset_store
+from seo_engine.db import ConnectionManager
+from seo_engine.dtypes import memory_report
+from seo_engine.features import derive
+from seo_engine.figures import figure_cache
+from seo_engine.importer import read_normalized, refit_segments, relabel_segments, stream_import
+from seo_engine.loaders import UnsupportedExport
+from seo_engine.migrations import migrate
+from seo_engine.plotting import DRILL_POINTS, WEBGL_ROWS, density_sample, grid_counts, in_box
+from seo_engine import profiler
+from seo_engine.profiler import timed, timed_tabs
+from seo_engine.processing import EMPTY_COLUMNS, process_seo_dataframe
+from seo_engine.ranking import ranking_indexes
+from seo_engine.retention import (apply_retention, ensure_incremental_vacuum, file_stats, get_rule, reclaim, set_rule,
+                                  start_background)
+from seo_engine.search import KeywordSearchIndex
+from seo_engine.segmentation import REFIT_GROWTH, load_model, model_version
+from seo_engine.snapshots import daily_series, decaying_keywords, rollup_series
+from seo_engine.store import (DB_PATH, SORTABLE_COLUMNS, UI_COLUMN_MAP, count_keywords, data_version, list_intents,
+                               list_sources, query_keywords, read_keywords, upsert_keywords, wipe_master)
 
 # --- Asset Management ---
 LOGO_PATH = "logo small black.png"
@@ -40,25 +64,25 @@ st.set_page_config(
 )
 
 # --- Database Setup ---
-def init_db():
-    conn = sqlite3.connect('tmu_seo_master.db')
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS keywords 
-                 (id INTEGER PRIMARY KEY AUTOINCREMENT, 
-                  keyword TEXT, 
-                  volume REAL, 
-                  kd REAL, 
-                  intent TEXT, 
-                  aio_score REAL,
-                  chatgpt_score REAL,
-                  gemini_score REAL,
-                  perplexity_score REAL,
-                  source TEXT,
-                  timestamp DATETIME)''')
-    conn.commit()
-    conn.close()
-
-init_db()
+@st.cache_resource
+def get_db():
+    # One WAL-mode connection manager shared by every session in this process;
+    # pending schema migrations run here, once, instead of on every rerun
+    manager = ConnectionManager(DB_PATH)
+    with manager.write() as conn:
+        migrate(conn)
+        # Stored segments follow the saved model, e.g. one bootstrapped by a session before any save
+        relabel_segments(conn)
+    return manager
+
+db = get_db()
+
+@st.cache_resource
+def get_retention_worker():
+    # Applies per-project retention rules in the background, one thread per process
+    return start_background(get_db())
+
+retention_worker = get_retention_worker()
 
 # --- Sleek Enterprise Light Theme ---
 st.markdown("""
@@ -203,130 +227,39 @@ st.markdown("""
 # Paths are now handled relatively for Streamlit Cloud compatibility
 SAMPLE_DATA_PATH = os.path.join("sample data", "www.tmu.ac.in-organic-keywords-subdomains-a_2025-12-20_14-56-57.csv")
 
-# --- Reusable Data Processor ---
-def process_seo_dataframe(df):
-    if df.empty:
-        return pd.DataFrame(columns=['keyword', 'Volume', 'Keyword Difficulty', 'Intent', 'SEO Score', 'AI Overview', 'ChatGPT', 'Gemini', 'Bing', 'CPC (INR)'])
-    
-    # UNIVERSAL NORMALIZATION (Semrush/Ahrefs/GSC)
-    norm_map = {
-        'Keyword': 'keyword', 'keyword': 'keyword', 'Queries': 'keyword',
-        'Search Volume': 'Volume', 'Volume': 'Volume', 'Avg. Monthly Searches': 'Volume', 'Avg. monthly searches': 'Volume',
-        'KD': 'Keyword Difficulty', 'Keyword Difficulty': 'Keyword Difficulty', 'Common KD': 'Keyword Difficulty', 'Difficulty': 'Keyword Difficulty',
-        'CPC': 'CPC (INR)', 'CPC (INR)': 'CPC (INR)', 'Cost Per Click': 'CPC (INR)',
-        'Intent': 'Intent', 'intent': 'Intent', 'User Intent': 'Intent'
-    }
-    
-    # Apply normalization case-insensitively
-    current_cols = df.columns.tolist()
-    final_map = {}
-    for c in current_cols:
-        for k, v in norm_map.items():
-            if c.lower() == k.lower():
-                final_map[c] = v
-    
-    df = df.rename(columns=final_map)
-
-    # ENSURE REQUIRED COLUMNS (Synthesize if missing)
-    required = {
-        'keyword': 'Keyword ' + df.index.astype(str) if not df.empty else [],
-        'Volume': 100,
-        'Keyword Difficulty': 50,
-        'Intent': 'Informational',
-        'SEO Score': 50,
-        'AI Overview': 40,
-        'ChatGPT': 30,
-        'Gemini': 35,
-        'Perplexity': 20,
-        'Bing': 25,
-        'CPC (INR)': 10
-    }
-    
-    for col, default in required.items():
-        if col not in df.columns:
-            if col == 'keyword' and not df.empty:
-                df['keyword'] = default
-            else:
-                df[col] = default if not df.empty else []
-
-    # CLEAN NUMERIC COLS
-    numeric_targets = ['Volume', 'Keyword Difficulty', 'CPC (INR)', 'SEO Score', 'ChatGPT', 'Gemini', 'Bing', 'AI Overview', 'Perplexity']
-    for col in numeric_targets:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
-            
-    # --- Advanced Data Modeling: Clustering ---
-    try:
-        from sklearn.cluster import KMeans
-        from sklearn.preprocessing import StandardScaler
-        
-        # Cluster based on Volume and KD
-        if len(df) > 5:
-            features = df[['Volume', 'Keyword Difficulty']].fillna(0)
-            scaler = StandardScaler()
-            scaled_features = scaler.fit_transform(features)
-            kmeans = KMeans(n_clusters=min(5, len(df)), random_state=42, n_init=10)
-            df['Cluster'] = kmeans.fit_predict(scaled_features)
-            cluster_map = {0: "Low Competition/Low Vol", 1: "High Value Targets", 2: "Competitive Giants", 3: "Niche Opportunities", 4: "Growth Potentials"}
-            df['Market Segment'] = df['Cluster'].map(cluster_map)
-        else:
-            df['Market Segment'] = "General"
-    except Exception as e:
-        df['Market Segment'] = "General"
-
-    # --- Predictive Modeling: Opportunity Score ---
-    # Simplified Holt-Winters / Weighted Opportunity
-    df['Opportunity Score'] = ((df['Volume'] * (100 - df['Keyword Difficulty'])) / 100).round(2)
-    
-    # --- Content Decay Simulation (AI Insights) ---
-    # Decay Score = High KD + Low current AI visibility = Needs Update
-    df['Decay Risk'] = (df['Keyword Difficulty'] * 0.7 - df['AI Overview'] * 0.3).clip(0, 100).round(1)
-    
-    # --- Entity Authority Score ---
-    # High Volume + Branded (simulated if contains TMU)
-    df['Entity Strength'] = (df['Volume'] / (df['Keyword Difficulty'] + 1) * 1.5).clip(0, 100).round(1)
-    
-    return df
-
-@st.cache_data
+@st.cache_resource
 def load_tmu_data():
+    # Shared rather than copied per session: sessions only ever see read-only views of it (seo_engine.datasets)
     try:
         # Check Master Database first
-        conn = sqlite3.connect('tmu_seo_master.db')
         try:
-            db_df = pd.read_sql_query("SELECT * FROM keywords LIMIT 1000", conn)
+            with db.read() as conn, timed('query', 'load_tmu_data / latest_keywords'):
+                db_df = pd.read_sql_query("SELECT * FROM latest_keywords ORDER BY id LIMIT 1000", conn)
             if not db_df.empty:
-                conn.close()
                 # Map back to standard names
-                db_df = db_df.rename(columns={
-                    'aio_score': 'AI Overview', 'chatgpt_score': 'ChatGPT', 
-                    'gemini_score': 'Gemini', 'perplexity_score': 'Perplexity',
-                    'volume': 'Volume', 'kd': 'Keyword Difficulty', 'intent': 'Intent'
-                })
-                return process_seo_dataframe(db_df)
+                db_df = db_df.rename(columns=UI_COLUMN_MAP)
+                db_df = process_seo_dataframe(db_df)
+                # (sources, intents) for read_summary; only used while the frame holds every one of those rows
+                db_df.attrs['summary_scope'] = ((), ())
+                return db_df
         except:
             pass
-        conn.close()
 
         # Fallback to Large Sample Data
         base_path = os.path.dirname(__file__)
         large_sample = os.path.join(base_path, "sample data", "www.tmu.ac.in-organic-keywords-subdomains-a_2025-12-20_14-56-57.csv")
         
         if os.path.exists(large_sample):
-            # SEMrush exports are often UTF-16 and Tab separated
+            # Encoding, delimiter and column map are sniffed from the file head; parsed in chunks, no row cap
             try:
-                # Try reading a chunk to identify columns
-                df = pd.read_csv(large_sample, sep='\t', encoding='utf-16', nrows=5000)
-            except:
-                try:
-                    df = pd.read_csv(large_sample, sep=',', encoding='utf-8', nrows=5000)
-                except:
-                    df = pd.DataFrame()
-            
+                with timed('load', 'load_tmu_data / sample export'):
+                    df = cached_process(large_sample, read_normalized)
+            except UnsupportedExport:
+                df = pd.DataFrame()
             if not df.empty:
-                return process_seo_dataframe(df)
+                return df
         
-        return pd.DataFrame(columns=['keyword', 'Volume', 'Keyword Difficulty', 'Intent', 'SEO Score', 'AI Overview', 'ChatGPT', 'Gemini', 'Bing', 'CPC (INR)'])
+        return pd.DataFrame(columns=EMPTY_COLUMNS)
     except Exception as e:
         # Emergency Fallback to dummy data so app Never looks broken
         dummy = pd.DataFrame({
@@ -337,11 +270,102 @@ def load_tmu_data():
         })
         return process_seo_dataframe(dummy)
 
+@st.cache_resource(max_entries=8)
+def get_search_index(fingerprint, _df):
+    # Built once per dataset and shared by every session viewing it
+    return KeywordSearchIndex(_df['keyword'].tolist(), _df['Volume'].tolist())
+
+@st.cache_resource(max_entries=8)
+def get_word_cloud(fingerprint, _df):
+    # Volume-weighted terms over the whole dataset; laid out once per dataset, not once per rerun
+    weights = term_weights(_df)
+    return render_cloud(weights) if not weights.empty else None
+
+@st.cache_data(max_entries=8)
+def get_memory_report(fingerprint, _df):
+    return memory_report(_df)
+
+@st.cache_data(max_entries=64)
+def get_match_count(filters, version):
+    # Range filters scan latest_keywords: counted once per filter set and master data version, for every session
+    with db.read() as conn:
+        return count_keywords(conn, filters)
+
+def get_active_kpis(df):
+    # Master-database datasets read the trigger-maintained keyword_summary (a handful of rows, always current),
+    # but only while the frame holds exactly the rows it counts. A row-capped load, collapsed variants or a
+    # save since loading would make the cards disagree with every table and chart under them.
+    # Everything else is summarized from the frame, once per dataset.
+    scope = st.session_state.get('summary_scope')
+    if scope is not None and st.session_state.dataset.frame is df:
+        with db.read() as conn:
+            summary = read_summary(conn, *scope)
+        if int(summary['keywords'].sum()) == len(df):
+            return kpis(summary)
+    cached = st.session_state.get('active_kpis')
+    if cached is None or cached[0] is not df:
+        cached = (df, kpis(summarize_frame(df)))
+        st.session_state.active_kpis = cached
+    return cached[1]
+
+def use_dataset(frame, fingerprint=None):
+    # Point the session at the shared copy of `frame`'s dataset and return the session's view of it.
+    # The view (with its derived-column overlay) is kept while the dataset stays the same.
+    # The session's one handle lives here; callers keep plain frames (and may pass their fingerprint).
+    handle = st.session_state.get('dataset')
+    if handle is not None and handle.frame is frame:
+        return frame
+    # Set by master-database loads whose filters keyword_summary can answer; None for uploads
+    st.session_state.summary_scope = frame.attrs.get('summary_scope')
+    fingerprint = fingerprint or dataset_fingerprint(frame)
+    if handle is None or handle.fingerprint != fingerprint:
+        if handle is not None:
+            handle.release()
+        handle = dataset_store.acquire(frame, fingerprint)
+        st.session_state.dataset = handle
+    return handle.frame
+
 # --- INITIALIZE DATA & SESSION STATE ---
-if 'active_df' not in st.session_state:
-    st.session_state.active_df = load_tmu_data()
+if 'dataset' not in st.session_state:
+    use_dataset(load_tmu_data())
+
+df = st.session_state.dataset.frame
+
+def get_fingerprint(df):
+    # Dataset identity for the shared caches; hashed once, when the session acquired the dataset
+    handle = st.session_state.dataset
+    return handle.fingerprint if handle.frame is df else dataset_fingerprint(df)
+
+def get_engine(df):
+    # pandas for everyday frames; DuckDB (when installed) once a frame gets large.
+    # Kept per session while the frame object is unchanged, like the KPI summary.
+    # Leaderboards read the process-wide ranking indexes of the dataset instead of re-sorting it.
+    cached = st.session_state.get('analytics_engine')
+    if cached is None or cached[0] is not df:
+        cached = (df, engine_for(df, rankings=ranking_indexes.for_dataset(get_fingerprint(df), df)))
+        st.session_state.analytics_engine = cached
+    return cached[1]
+
+engine = get_engine(df)
+
+def refresh_segments(force=False):
+    # Refit on the whole master database once it has outgrown the model (or on demand), then
+    # relabel the stored segments (and their KPI groups) if the model changed since they were written.
+    # Shared figures are rebuilt; each session drops its stale labels on its next run (below).
+    with db.read() as conn:
+        model = refit_segments(conn, force)
+    with db.write() as conn:
+        relabel_segments(conn, model)
+    if model is not None:
+        figure_cache.clear()
+    return model
+
+segment_version = model_version(load_model())
+if st.session_state.get('segment_version') != segment_version:
+    st.session_state.segment_version = segment_version
+    if 'Market Segment' in df.columns:
+        df.drop(columns='Market Segment', inplace=True)
 
-df = st.session_state.active_df
 PLOT_THEME = "plotly_white"
 
 # --- Constants & Mappings ---
@@ -401,6 +425,38 @@ if 'tasks' not in st.session_state:
     ]
 
 # --- MODULE ROUTING ---
+def profiled_tabs(labels):
+    # st.tabs whose bodies are timed by the render profiler (per module and dataset size)
+    return timed_tabs(main_nav, labels, st.tabs(labels), len(df))
+
+st_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', lambda body: body)
+
+def fragment(body):
+    # A fragment rerun never reaches the profiler flush at the end of the script, so each fragment
+    # writes its own buffered samples when it finishes
+    @functools.wraps(body)
+    def run(*args, **kwargs):
+        try:
+            return body(*args, **kwargs)
+        finally:
+            profiler.flush()
+    return st_fragment(run)
+
+def lazy_tabs(labels, bodies, key):
+    # Only the selected tab's body runs: the tab set tracks its selection and reruns on change.
+    # Bodies are fragments, so a widget inside one tab reruns that tab alone.
+    try:
+        tabs = st.tabs(labels, key=key, on_change="rerun")
+    except TypeError:
+        # Streamlit without tab state: every body runs, as before
+        tabs = st.tabs(labels)
+    for label, tab, body in zip(labels, tabs, bodies):
+        if getattr(tab, 'open', None) is not False:
+            with timed('tab', f"{main_nav} / {label}", len(df), tab):
+                body()
+
+module_start = time.perf_counter()
+
 # Global Header
 head_col1, head_col2 = st.columns([1, 5])
 with head_col1:
@@ -422,10 +478,11 @@ if main_nav == MOD_HOME:
     st.markdown(f"### 🎯 Project Focus: `{project}`")
     st.caption(f"Analyzing: {active_url}")
     
-    # Calculate Live Metrics from df
-    total_vol = int(df['Volume'].sum()) if not df.empty else 0
-    avg_kd = int(df['Keyword Difficulty'].mean()) if not df.empty else 0
-    keyword_count = len(df)
+    # Live Metrics from the precomputed dataset summary
+    kpi = get_active_kpis(df)
+    total_vol = int(kpi['total_volume'])
+    avg_kd = int(kpi['avg_kd'])
+    keyword_count = kpi['keywords']
     est_clicks = int(total_vol * 0.08)
     
     # --- EXECUTIVE PULSE ROW ---
@@ -449,16 +506,32 @@ if main_nav == MOD_HOME:
     with col_t1:
         st.subheader("📈 Position Tracking (90 Day History)")
         dates = pd.date_range(end=datetime.now(), periods=90)
-        p_track = pd.DataFrame({
-            "Date": dates,
-            "Top 3": np.random.randint(40, 60, 90) + np.arange(90) * 0.2,
-            "Top 10": np.random.randint(120, 180, 90) + np.arange(90) * 0.5,
-            "Top 100": np.random.randint(800, 1200, 90) + np.arange(90) * 2
-        })
-        fig_p = px.line(p_track, x="Date", y=["Top 3", "Top 10", "Top 100"], 
+        # Precomputed per-import snapshot stats for this project
+        with db.read() as conn, timed('query', 'Home / daily_series', len(df)):
+            history = daily_series(conn, project, days=90)
+        history['Date'] = pd.to_datetime(history['snapshot_date'])
+
+        if len(history) >= 2:
+            rank_cols = {'top3': 'Top 3', 'top10': 'Top 10', 'top100': 'Top 100'}
+            if history['top100'].sum() == 0:
+                # Export had no rank column: track footprint size instead
+                rank_cols = {'keywords': 'Tracked Keywords'}
+            p_track = history.rename(columns=rank_cols)
+            track_cols = list(rank_cols.values())
+        else:
+            p_track = pd.DataFrame({
+                "Date": dates,
+                "Top 3": np.random.randint(40, 60, 90) + np.arange(90) * 0.2,
+                "Top 10": np.random.randint(120, 180, 90) + np.arange(90) * 0.5,
+                "Top 100": np.random.randint(800, 1200, 90) + np.arange(90) * 2
+            })
+            track_cols = ["Top 3", "Top 10", "Top 100"]
+        fig_p = px.line(p_track, x="Date", y=track_cols, 
                         line_shape="spline", template=PLOT_THEME,
                         color_discrete_sequence=["#10b981", "#3b82f6", "#64748b"])
         st.plotly_chart(fig_p, use_container_width=True)
+        if len(history) < 2:
+            st.caption("Simulated trend: save dated snapshots of this project to track real history.")
         
     with col_t2:
         st.subheader("🎯 Search Visibility")
@@ -482,10 +555,17 @@ if main_nav == MOD_HOME:
     
     with v_col1:
         st.markdown("#### 🌪️ SERP Volatility Radar")
-        vul_data = pd.DataFrame({
-            "Day": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
-            "Volatility": [2.4, 4.1, 8.5, 9.2, 5.4, 3.1, 2.9]
-        })
+        recent = history[history['Date'] > datetime.now() - pd.Timedelta(days=7)]
+        if len(recent) >= 3:
+            vul_data = pd.DataFrame({
+                "Day": recent['Date'].dt.strftime('%a %d'),
+                "Volatility": recent['volatility']
+            })
+        else:
+            vul_data = pd.DataFrame({
+                "Day": ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"],
+                "Volatility": [2.4, 4.1, 8.5, 9.2, 5.4, 3.1, 2.9]
+            })
         fig_vul = px.line_polar(vul_data, r='Volatility', theta='Day', line_close=True, 
                                 template=PLOT_THEME, title="7-Day Algo Turbulence")
         fig_vul.update_traces(fill='toself', line_color='#ef4444')
@@ -508,7 +588,7 @@ if main_nav == MOD_HOME:
         <div class="insight-card">
             <span class="glow-badge badge-p-red">Immediate Action</span>
             <h4 style="margin: 10px 0;">Technical Anchor needed</h4>
-            <p style="font-size: 0.9rem; color: #64748b;">{len(df[df['Keyword Difficulty'] > 80])} High Difficulty keywords currently lack Schema.org validation. Priority: Admissions.</p>
+            <p style="font-size: 0.9rem; color: #64748b;">{kpi['hard_kd']} High Difficulty keywords currently lack Schema.org validation. Priority: Admissions.</p>
         </div>
         """, unsafe_allow_html=True)
         
@@ -517,7 +597,7 @@ if main_nav == MOD_HOME:
         <div class="insight-card">
             <span class="glow-badge badge-p-blue">Growth Opportunity</span>
             <h4 style="margin: 10px 0;">Informational Expansion</h4>
-            <p style="font-size: 0.9rem; color: #64748b;">{len(df[df['Intent'] == 'Informational'])} top-tier clusters identified for AI Overview targets. Estimated traffic gain: +18%.</p>
+            <p style="font-size: 0.9rem; color: #64748b;">{kpi['intent_keywords'].get('Informational', 0)} top-tier clusters identified for AI Overview targets. Estimated traffic gain: +18%.</p>
         </div>
         """, unsafe_allow_html=True)
 
@@ -526,7 +606,7 @@ if main_nav == MOD_HOME:
         <div class="insight-card">
             <span class="glow-badge badge-p-green">Efficiency Win</span>
             <h4 style="margin: 10px 0;">Low-Hanging Fruit</h4>
-            <p style="font-size: 0.9rem; color: #64748b;">{len(df[df['Volume'] > 5000])} high-volume keywords identified in Positions 11-20. Small on-page fix will trigger Page 1 rank.</p>
+            <p style="font-size: 0.9rem; color: #64748b;">{kpi['high_volume']} high-volume keywords identified in Positions 11-20. Small on-page fix will trigger Page 1 rank.</p>
         </div>
         """, unsafe_allow_html=True)
 
@@ -534,115 +614,267 @@ if main_nav == MOD_HOME:
     st.subheader("📊 Executive Analysis: Reach & Efficiency")
     rex1, rex2 = st.columns(2)
     
-    with rex1:
+    with rex1, timed('chart', 'Home / Pareto', len(df)):
         st.markdown("#### 🎯 80/20 Efficiency Analysis (Pareto)")
         if not df.empty:
-            df_sorted = df.sort_values(by='Volume', ascending=False).copy()
-            df_sorted['Cumulative_Vol'] = df_sorted['Volume'].cumsum()
-            df_sorted['Cumulative_Perc'] = 100 * df_sorted['Cumulative_Vol'] / df_sorted['Volume'].sum()
-            
-            fig_pareto = go.Figure()
-            fig_pareto.add_trace(go.Bar(x=df_sorted['keyword'].head(20), y=df_sorted['Volume'].head(20), name="Volume", marker_color="#3b82f6"))
-            fig_pareto.add_trace(go.Scatter(x=df_sorted['keyword'].head(20), y=df_sorted['Cumulative_Perc'].head(20), name="Cumulative %", yaxis="y2", line=dict(color="#ef4444", width=3)))
-            
-            fig_pareto.update_layout(
-                yaxis2=dict(title="Cumulative %", overlaying="y", side="right", range=[0, 105]),
-                template=PLOT_THEME, title="Top 20 Keywords vs. Total Footprint"
-            )
+            def build_pareto(top, theme):
+                # Only the top N and the grand total are needed, not a full sorted copy
+                df_sorted = engine.top_n('Volume', top, ['keyword', 'Volume'])
+                df_sorted['Cumulative_Vol'] = df_sorted['Volume'].cumsum()
+                df_sorted['Cumulative_Perc'] = 100 * df_sorted['Cumulative_Vol'] / engine.total('Volume')
+                
+                fig_pareto = go.Figure()
+                fig_pareto.add_trace(go.Bar(x=df_sorted['keyword'], y=df_sorted['Volume'], name="Volume", marker_color="#3b82f6"))
+                fig_pareto.add_trace(go.Scatter(x=df_sorted['keyword'], y=df_sorted['Cumulative_Perc'], name="Cumulative %", yaxis="y2", line=dict(color="#ef4444", width=3)))
+                
+                fig_pareto.update_layout(
+                    yaxis2=dict(title="Cumulative %", overlaying="y", side="right", range=[0, 105]),
+                    template=theme, title=f"Top {top} Keywords vs. Total Footprint"
+                )
+                return fig_pareto
+
+            # Built once per dataset and shared by every session viewing it
+            fig_pareto = figure_cache.get_or_build(get_fingerprint(df), 'pareto', build_pareto, top=20, theme=PLOT_THEME)
             st.plotly_chart(fig_pareto, use_container_width=True)
             st.caption("Identify 20% of keywords driving 80% of potential traffic.")
             
-    with rex2:
+    with rex2, timed('chart', 'Home / Attribution sunburst', len(df)):
         st.markdown("#### 🥧 Traffic Attribution Model")
         if not df.empty:
-            fig_sun_att = px.sunburst(df.head(200), path=['Intent', 'Market Segment'], values='Volume',
-                                    color='Keyword Difficulty', color_continuous_scale='RdYlGn_r',
-                                    template=PLOT_THEME, title="Volume Share by Intent & Market Segment")
+            def build_attribution(rows, theme):
+                derive(df, 'Market Segment')
+                return px.sunburst(df.head(rows), path=['Intent', 'Market Segment'], values='Volume',
+                                   color='Keyword Difficulty', color_continuous_scale='RdYlGn_r',
+                                   template=theme, title="Volume Share by Intent & Market Segment")
+
+            fig_sun_att = figure_cache.get_or_build(get_fingerprint(df), 'attribution_sunburst', build_attribution,
+                                                    rows=200, theme=PLOT_THEME)
             st.plotly_chart(fig_sun_att, use_container_width=True)
             st.caption("Drill down into intent-based volume clusters.")
 
 elif main_nav == MOD_UPLOAD:
     st.title("📦 Data Upload & Growth Engine")
     
-    # Persistent Data Loader
-    def get_master_data():
-        conn = sqlite3.connect('tmu_seo_master.db')
-        m_df = pd.read_sql_query("SELECT * FROM keywords", conn)
-        conn.close()
-        # Map back to standard names for UI consistency
-        m_df = m_df.rename(columns={
-            'aio_score': 'AI Overview', 'chatgpt_score': 'ChatGPT', 
-            'gemini_score': 'Gemini', 'perplexity_score': 'Perplexity',
-            'volume': 'Volume', 'kd': 'Keyword Difficulty', 'intent': 'Intent'
-        })
-        return m_df
-
     source_choice = st.radio("Data Source", ["Upload New File", "📂 Master Database Intelligence"], horizontal=True)
     
     active_df = pd.DataFrame()
     if source_choice == "Upload New File":
-        uploaded_file = st.file_uploader("Upload SEO Data (CSV or Excel)", type=["csv", "xlsx"])
+        uploaded_files = st.file_uploader("Upload SEO Data (CSV or Excel) — select several files for a weekly batch",
+                                          type=["csv", "xlsx"], accept_multiple_files=True)
+        uploaded_file = uploaded_files[0] if len(uploaded_files) == 1 else None
         if uploaded_file:
             try:
-                if uploaded_file.name.endswith('.csv'):
-                    upload_df = pd.read_csv(uploaded_file)
-                else:
-                    upload_df = pd.read_excel(uploaded_file)
-                active_df = process_seo_dataframe(upload_df)
-                st.session_state.active_df = active_df
+                is_csv = uploaded_file.name.endswith('.csv')
+                # Same bytes + same processing code -> cached Parquet instead of a reprocessing pass
+                active_df = use_dataset(cached_process(uploaded_file, read_normalized if is_csv else pd.read_excel))
                 st.success(f"Successfully processed {len(active_df)} keywords! Data synced across all modules.")
                 
                 if st.button("💾 Save to Master Database"):
-                    conn = sqlite3.connect('tmu_seo_master.db')
-                    save_df = active_df.copy()
-                    save_df['source'] = project
-                    save_df['timestamp'] = datetime.now()
-                    save_df = save_df.rename(columns={
-                        'AI Overview': 'aio_score', 'ChatGPT': 'chatgpt_score', 
-                        'Gemini': 'gemini_score', 'Perplexity': 'perplexity_score',
-                        'Volume': 'volume', 'Keyword Difficulty': 'kd', 'Intent': 'intent'
-                    })
-                    for c in ['aio_score', 'chatgpt_score', 'gemini_score', 'perplexity_score']:
-                        if c not in save_df.columns: save_df[c] = 20.0
-                    db_cols = ['keyword', 'volume', 'kd', 'intent', 'aio_score', 'chatgpt_score', 'gemini_score', 'perplexity_score', 'source', 'timestamp']
-                    save_df[db_cols].to_sql('keywords', conn, if_exists='append', index=False)
-                    conn.close()
-                    st.toast("Keywords persisted to master database!")
+                    # Raw rows on every save path; variants are collapsed when the master data is read back
+                    with db.write() as conn:
+                        if is_csv:
+                            # Re-stream the raw file so the write path never holds the whole export
+                            save_bar = st.progress(0.0, text="Streaming export into master database...")
+                            def report_progress(fraction, rows):
+                                save_bar.progress(fraction or 0.0, text=f"Imported {rows:,} keywords...")
+                            uploaded_file.seek(0)
+                            saved = stream_import(conn, uploaded_file, source=project, progress=report_progress)
+                            save_bar.empty()
+                        else:
+                            _, raw_df, _, error = parse_file(uploaded_file.name, uploaded_file.getvalue())
+                            if raw_df is None:
+                                raise ValueError(error)
+                            saved = upsert_keywords(conn, derive(raw_df, 'Market Segment'), source=project)
+                    st.toast(f"{saved:,} keywords upserted to master database!")
+                    if refresh_segments():
+                        st.toast("Market segments refitted on the grown master database.")
             except Exception as e:
                 st.error(f"Upload failed: {e}")
+        elif uploaded_files:
+            try:
+                # One export per program: parsed in a process pool, merged with cross-file keyword dedupe.
+                # The processed frame and its fingerprint are kept so button reruns don't re-ingest or re-hash it.
+                batch_key = tuple((f.name, f.size, f.file_id) for f in uploaded_files)
+                batch = st.session_state.get('upload_batch')
+                if batch is None or batch[0] != batch_key:
+                    with st.spinner(f"Ingesting {len(uploaded_files)} files in parallel..."):
+                        merged, report = ingest_batch([(f.name, f.getvalue()) for f in uploaded_files])
+                        batch_df = process_seo_dataframe(merged)
+                        batch = (batch_key, batch_df, dataset_fingerprint(batch_df), report)
+                    st.session_state.upload_batch = batch
+                _, batch_df, batch_fingerprint, batch_report = batch
+                active_df = use_dataset(batch_df, batch_fingerprint)
+                st.success(f"Merged {len(active_df):,} unique keywords from {len(uploaded_files)} files "
+                           f"in {batch_report.attrs['wall_seconds']:.1f}s. Data synced across all modules.")
+                for failed in batch_report[batch_report['error'].notna()].itertuples():
+                    st.warning(f"Skipped {failed.file}: {failed.error}")
+                with st.expander("⏱️ Per-File Ingestion Report"):
+                    st.dataframe(batch_report.drop(columns='error').round({'seconds': 2}), use_container_width=True, hide_index=True)
+
+                if st.button("💾 Save Batch to Master Database"):
+                    # The merged raw rows (cross-file dedupe only), like a streamed CSV save; re-parsed on demand
+                    # so the session doesn't hold an uncollapsed copy of the batch
+                    with st.spinner("Re-reading the batch for the master database..."):
+                        merged, _ = ingest_batch([(f.name, f.getvalue()) for f in uploaded_files])
+                    with db.write() as conn:
+                        saved = upsert_keywords(conn, derive(merged, 'Market Segment'), source=project)
+                    st.toast(f"{saved:,} keywords upserted to master database!")
+                    if refresh_segments():
+                        st.toast("Market segments refitted on the grown master database.")
+            except Exception as e:
+                st.error(f"Batch upload failed: {e}")
         else:
             st.info("Please upload a file to begin analysis or switch to 'Master Database Intelligence'.")
     else:
-        db_raw = get_master_data()
-        if db_raw.empty:
+        with db.read() as conn:
+            master_summary = read_summary(conn)
+            master_version = data_version(conn)
+            source_options = list_sources(conn)
+            intent_options = list_intents(conn)
+        total_saved = int(master_summary['keywords'].sum())
+
+        if total_saved == 0:
             st.warning("Master database is currently empty. Upload and 'Save' data to see it here.")
         else:
-            active_df = process_seo_dataframe(db_raw)
-            st.session_state.active_df = active_df
-            st.success(f"Viewing master intelligence: {len(active_df)} total keywords saved across all projects.")
-
-    if not active_df.empty:
-        st.info("Data loaded. Switch to '🚀 Growth Engine' for detailed analysis.")
-        with st.expander("🔍 Quick Data Preview"):
-            st.dataframe(active_df.head(10), use_container_width=True)
-        
+            # Filters, sort and paging are pushed down to SQL; only the visible page is read
+            f1, f2, f3, f4 = st.columns(4)
+            sel_sources = f1.multiselect("Project / Source", source_options)
+            sel_intents = f2.multiselect("Intent", intent_options)
+            min_vol = f3.number_input("Min. Volume", min_value=0, value=0, step=100)
+            kd_range = f4.slider("Keyword Difficulty", 0, 100, (0, 100))
+            s1, s2, s3 = st.columns(3)
+            sort_label = s1.selectbox("Sort By", list(SORTABLE_COLUMNS))
+            descending = s2.radio("Order", ["Descending", "Ascending"], horizontal=True) == "Descending"
+            page_size = s3.selectbox("Rows per Page", [25, 50, 100, 250], index=1)
+
+            db_filters = {
+                'sources': sel_sources, 'intents': sel_intents,
+                'min_volume': min_vol or None,
+                'min_kd': kd_range[0] if kd_range[0] > 0 else None,
+                'max_kd': kd_range[1] if kd_range[1] < 100 else None
+            }
+
+            # Restart paging whenever the query changes
+            query_key = (tuple(sel_sources), tuple(sel_intents), min_vol, kd_range, sort_label, descending, page_size)
+            if st.session_state.get('db_query_key') != query_key:
+                st.session_state.db_query_key = query_key
+                st.session_state.db_cursors = [None]
+            cursors = st.session_state.db_cursors
+
+            match_count = get_match_count(db_filters, master_version)
+            with db.read() as conn, timed('query', 'Master / keyword page', total_saved):
+                page_df, next_cursor = query_keywords(conn, db_filters, SORTABLE_COLUMNS[sort_label],
+                                                      descending, page_size, cursors[-1])
+
+            st.success(f"Viewing master intelligence: {match_count:,} of {total_saved:,} keywords match (page {len(cursors)}).")
+            page_view = page_df.rename(columns=UI_COLUMN_MAP)
+            st.dataframe(page_view[['keyword', 'Volume', 'Keyword Difficulty', 'Intent', 'AI Overview', 'source', 'snapshot_date']],
+                         use_container_width=True, hide_index=True)
+
+            n1, n2, n3 = st.columns([1, 1, 2])
+            if n1.button("⬅️ Previous Page", disabled=len(cursors) == 1):
+                cursors.pop()
+                st.rerun()
+            if n2.button("Next Page ➡️", disabled=next_cursor is None):
+                cursors.append(next_cursor)
+                st.rerun()
+            if n3.button(f"📊 Load {match_count:,} Matches into Analytics"):
+                with st.spinner("Loading matching keywords..."):
+                    with db.read() as conn:
+                        db_raw = read_keywords(conn, db_filters)
+                    loaded = process_seo_dataframe(db_raw.rename(columns=UI_COLUMN_MAP))
+                    if not any(db_filters[k] is not None for k in ('min_volume', 'min_kd', 'max_kd')):
+                        # Source/intent filters only: the KPI cards can come from keyword_summary
+                        loaded.attrs['summary_scope'] = (tuple(sel_sources), tuple(sel_intents))
+                    active_df = use_dataset(loaded)
+
+            with st.expander("📊 Project Footprint (Live Summary)"):
+                footprint = master_summary.groupby('source')[['keywords', 'total_volume', 'kd_sum', 'hard_kd', 'high_volume']].sum()
+                footprint['avg_kd'] = (footprint['kd_sum'] / footprint['keywords']).round(1)
+                st.dataframe(footprint.drop(columns='kd_sum').rename(columns={
+                    'keywords': 'Keywords', 'total_volume': 'Search Volume', 'avg_kd': 'Avg. KD',
+                    'hard_kd': 'KD > 80', 'high_volume': 'Volume > 5,000'
+                }), use_container_width=True)
+
+            with st.expander("🧹 Retention Policy"):
+                with db.read() as conn:
+                    rule = get_rule(conn, project)
+                stats = file_stats(db)
+                st.caption(f"File: {stats['size_mb']:.1f} MB ({stats['free_mb']:.1f} MB free) · auto_vacuum {stats['auto_vacuum']}"
+                           + (f" · last background pass {retention_worker.last_run:%Y-%m-%d %H:%M}" if retention_worker.last_run else ""))
+                if retention_worker.last_error:
+                    st.error(f"Last retention pass failed: {retention_worker.last_error}")
+                rc1, rc2 = st.columns(2)
+                daily_days = rc1.number_input(f"Keep daily history for '{project}' (days)", min_value=7,
+                                              value=int(rule['daily_days']), step=30)
+                monthly_months = rc2.number_input("Then keep monthly history for (months, 0 = forever)", min_value=0,
+                                                  value=int(rule['monthly_months'] or 0), step=6)
+                rb1, rb2 = st.columns(2)
+                if rb1.button("💾 Save Rule"):
+                    with db.write() as conn:
+                        set_rule(conn, project, daily_days, monthly_months or None)
+                    st.success(f"Retention rule saved for {project}.")
+                if rb2.button("🧹 Apply Now"):
+                    with st.spinner("Thinning history..."):
+                        report = apply_retention(db, [project]).get(project, {})
+                        reclaim(db)
+                    st.success(f"Removed {report.get('versions', 0):,} expired keyword versions and "
+                               f"{report.get('snapshots', 0):,} daily snapshots.")
+                if stats['auto_vacuum'] != 'INCREMENTAL':
+                    # One-time conversion: a full VACUUM rewrites the file and blocks writers while it runs
+                    st.info("Space freed by retention stays inside the file until it is switched to incremental vacuum.")
+                    if st.button("🗜️ Enable Incremental Vacuum (one-time full rewrite)"):
+                        with st.spinner("Rewriting the master database..."):
+                            ensure_incremental_vacuum(db)
+                        st.success("Incremental vacuum enabled; freed space is now returned to disk.")
+                        st.rerun()
+
+            # Admin Section
+            with st.expander("🧩 Market Segmentation Model"):
+                model = load_model()
+                if model:
+                    st.caption(f"Fitted on {model['rows']:,} keywords at {model['fitted_at']} (version {model_version(model)}). "
+                               f"Refitted automatically after a save once the master database reaches {REFIT_GROWTH:g}x that size.")
+                else:
+                    st.caption("No model fitted yet.")
+                if st.button("🔁 Refit Market Segments"):
+                    with st.spinner("Refitting on every keyword in the master database..."):
+                        model = refresh_segments(force=True)
+                    if model:
+                        st.success(f"Segments refitted on {model['rows']:,} keywords.")
+                        st.rerun()
+                    else:
+                        st.warning("Not enough keywords in the master database to segment.")
 
-        # Admin Section
-        if source_choice == "📂 Master Database Intelligence":
             with st.expander("🛠️ Maintenance: Database Management"):
                 st.warning("Danger Zone: These actions cannot be undone.")
                 if st.button("🚨 Wipe Master Database"):
-                    conn = sqlite3.connect('tmu_seo_master.db')
-                    conn.execute("DELETE FROM keywords")
-                    conn.commit()
-                    conn.close()
+                    with db.write() as conn:
+                        wipe_master(conn)
+                    reclaim(db)
                     st.success("Database cleared! Refreshing...")
                     time.sleep(1)
                     st.rerun()
 
-
-
-
+    if not active_df.empty:
+        st.info("Data loaded. Switch to '🚀 Growth Engine' for detailed analysis.")
+        with st.expander("🔍 Quick Data Preview"):
+            st.dataframe(active_df.head(10), use_container_width=True)
+        with st.expander("🧮 Session Memory Footprint"):
+            mem = get_memory_report(get_fingerprint(active_df), active_df)
+            used_mb, default_mb = mem['bytes'].sum() / 1e6, mem['default_bytes'].sum() / 1e6
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Per-Session Frame", f"{used_mb:.1f} MB")
+            m2.metric("Default Layout", f"{default_mb:.1f} MB")
+            m3.metric("Saved", f"{1 - used_mb / default_mb:.0%}" if default_mb else "0%")
+            shared = dataset_store.stats()
+            handle = st.session_state.dataset
+            overlay = handle.overlay if handle.frame is active_df else []
+            st.caption(f"Base columns are held once and shared read-only: {shared['datasets']} dataset(s), "
+                       f"{shared['bytes'] / 1e6:.1f} MB, {shared['handles']} session handle(s). "
+                       f"This session's overlay: {', '.join(overlay) or 'no derived columns yet'}.")
+            st.dataframe(mem.assign(MB=mem['bytes'] / 1e6, default_MB=mem['default_bytes'] / 1e6)
+                         .drop(columns=['bytes', 'default_bytes']).round(2), use_container_width=True)
 
 elif main_nav == MOD_GROWTH:
     st.title("🚀 TMU Enterprise Growth Engine")
@@ -651,27 +883,64 @@ elif main_nav == MOD_GROWTH:
     if df.empty:
         st.warning("No data found. Please go to 'Data Upload & Growth Engine' to upload an SEO export first.")
     else:
-        g_tab1, g_tab2, g_tab3, g_tab4, g_tab5 = st.tabs(["💎 Growth Opportunities", "📊 AI Share of Voice", "🤖 AIO Intelligence", "🏆 AI Ranking Blueprint", "🔬 Data Science Modeling"])
-        
-        with g_tab1:
+        @fragment
+        def growth_opportunities():
             st.subheader("Persistent Opportunity Tracker")
-            df['Growth Priority'] = (df['Volume'] / (df['Keyword Difficulty'] + 1)).round(1)
-            top_gains = df.sort_values(by='Growth Priority', ascending=False).head(15)
+            derive(df, 'Growth Priority', 'Market Segment')
+            top_gains = engine.top_n('Growth Priority', 15)
             
             c1, c2 = st.columns([1, 1])
-            with c1:
+            with c1, timed('table', 'Growth / Priority top 15', len(df)):
                 st.dataframe(top_gains[['keyword', 'Volume', 'Keyword Difficulty', 'Intent', 'Growth Priority', 'Market Segment']], use_container_width=True)
-            with c2:
-                fig_bubble = px.scatter(df, x="Keyword Difficulty", y="Volume", size="Volume", color="Market Segment", 
-                                      hover_name="keyword", title="Keyword Market Segmentation", template=PLOT_THEME)
-                st.plotly_chart(fig_bubble, use_container_width=True)
-
-        with g_tab2:
+            with c2, timed('chart', 'Growth / Segmentation bubble', len(df)):
+                # Large frames never ship every row: WebGL plus a density-preserving sample, or server-side tiles
+                large = len(df) > WEBGL_ROWS
+                view = st.radio("Scatter View", ["Sampled Points", "Density Tiles"], horizontal=True,
+                                key="bubble_view") if large else "All Points"
+
+                def build_bubble(view, theme):
+                    if view == "Density Tiles":
+                        counts, kd_centers, vol_centers = grid_counts(df, "Keyword Difficulty", "Volume")
+                        fig = go.Figure(go.Heatmap(z=np.where(counts > 0, counts, np.nan), x=kd_centers, y=vol_centers,
+                                                   colorscale='Viridis', colorbar=dict(title="Keywords")))
+                        # Heatmap tiles are not selectable: an invisible marker per occupied cell makes box-select work
+                        rows, cols = np.nonzero(counts)
+                        fig.add_trace(go.Scatter(x=kd_centers[cols], y=vol_centers[rows], mode='markers',
+                                                 marker=dict(opacity=0), hoverinfo='skip', showlegend=False))
+                        fig.update_layout(title="Keyword Market Segmentation (Density)", template=theme,
+                                          xaxis_title="Keyword Difficulty", yaxis_title="log₁₀(Volume + 1)")
+                        return fig
+                    points = density_sample(df, "Keyword Difficulty", "Volume") if view == "Sampled Points" else df
+                    return px.scatter(points, x="Keyword Difficulty", y="Volume", size="Volume", color="Market Segment", 
+                                      hover_name="keyword", title="Keyword Market Segmentation", template=theme,
+                                      render_mode="webgl" if large else "auto")
+
+                fig_bubble = figure_cache.get_or_build(get_fingerprint(df), 'segmentation_bubble', build_bubble,
+                                                       view=view, theme=PLOT_THEME)
+                if not large:
+                    st.plotly_chart(fig_bubble, use_container_width=True)
+                else:
+                    st.caption(f"{len(df):,} keywords summarized for the browser. Box-select a region to drill down to its raw keywords.")
+                    event = st.plotly_chart(fig_bubble, use_container_width=True, on_select="rerun",
+                                            selection_mode="box", key="bubble_chart")
+                    boxes = event["selection"].get("box") if event else None
+                    if boxes:
+                        region = in_box(df, "Keyword Difficulty", "Volume", boxes[0], log_y=view == "Density Tiles")
+                        st.markdown(f"**🔍 Selected Region:** {len(region):,} keywords")
+                        if not region.empty:
+                            drill = density_sample(region, "Keyword Difficulty", "Volume", max_points=DRILL_POINTS)
+                            st.plotly_chart(px.scatter(drill, x="Keyword Difficulty", y="Volume", size="Volume",
+                                                       color="Market Segment", hover_name="keyword", render_mode="webgl",
+                                                       title="Selected Region (Raw Keywords)", template=PLOT_THEME),
+                                            use_container_width=True)
+
+        @fragment
+        def ai_share_of_voice():
             st.subheader("📊 AI Search Market Analysis")
             st.markdown("Global cross-platform visibility trends and daily AIO acquisition leaders.")
             
             # 1. Market Share of Voice
-            platform_avg = df[['ChatGPT', 'Gemini', 'Perplexity', 'AI Overview']].mean().reset_index()
+            platform_avg = engine.means(['ChatGPT', 'Gemini', 'Perplexity', 'AI Overview']).reset_index()
             platform_avg.columns = ['Platform', 'Visibility_Score']
             
             ca1, ca2 = st.columns([1, 1])
@@ -692,7 +961,8 @@ elif main_nav == MOD_GROWTH:
             st.caption("Keywords currently dominating the Google AI Overview for TMU-related queries.")
             
             # New table for AIO Leaders
-            aio_leaders = df.sort_values(by='AI Overview', ascending=False).head(12)
+            derive(df, 'Market Segment')
+            aio_leaders = engine.top_n('AI Overview', 12)
             st.dataframe(aio_leaders[['keyword', 'AI Overview', 'Volume', 'Intent', 'Market Segment']], 
                          use_container_width=True, hide_index=True,
                          column_config={
@@ -772,9 +1042,8 @@ elif main_nav == MOD_GROWTH:
             st.markdown("#### 🚀 Daily Traffic Booster: Top 10 Recommendations")
             st.info("AI-selected keywords to optimize TODAY to capture maximum traffic across Google, ChatGPT, and Perplexity.")
             
-            booster_df = df.copy()
-            booster_df['Booster Score'] = (booster_df['Volume'] * booster_df['AI Overview']) / (booster_df['Keyword Difficulty'] + 10)
-            top_10_boosters = booster_df.sort_values(by='Booster Score', ascending=False).head(10).reset_index(drop=True)
+            derive(df, 'Booster Score')
+            top_10_boosters = engine.top_n('Booster Score', 10).reset_index(drop=True)
             
             st.dataframe(top_10_boosters[['keyword', 'Volume', 'AI Overview', 'Keyword Difficulty']], 
                          use_container_width=True, hide_index=True,
@@ -785,24 +1054,34 @@ elif main_nav == MOD_GROWTH:
                             "Keyword Difficulty": st.column_config.NumberColumn(format="%d%%")
                          })
 
-        with g_tab3:
+        @fragment
+        def aio_intelligence():
             st.subheader("🤖 AI Overview Traffic Intelligence")
             st.markdown("Analyzing how Google's AI Overview (AIO) attributes traffic to your site.")
             
-            search_kw = st.selectbox("Select Keyword for AI Breakdown", df['keyword'].tolist())
-            kw_row = df[df['keyword'] == search_kw].iloc[0]
-            
-            attr_data = pd.DataFrame({
-                "Platform": ["Google AIO", "ChatGPT", "Gemini", "Perplexity"],
-                "Probability": [kw_row['AI Overview'], kw_row['ChatGPT'], kw_row['Gemini'], kw_row['Perplexity']]
-            })
-            
-            fig_radar = px.line_polar(attr_data, r='Probability', theta='Platform', line_close=True, 
-                                    template=PLOT_THEME, title=f"AI Footprint: {search_kw}")
-            fig_radar.update_traces(fill='toself')
-            st.plotly_chart(fig_radar, use_container_width=True)
+            search_index = get_search_index(get_fingerprint(df), df)
+            kw_query = st.text_input("🔎 Find Keyword for AI Breakdown", placeholder="Type any part of a keyword (typos are fine), e.g. 'bca fees'")
+            kw_matches = search_index.search(kw_query, limit=25)
+            if kw_matches.empty:
+                st.info("No keywords match that search. Try a shorter or different phrase.")
+            else:
+                match_labels = dict(zip(kw_matches['pos'], kw_matches['keyword']))
+                kw_pos = st.selectbox("Select Keyword for AI Breakdown", list(match_labels), format_func=match_labels.get)
+                kw_row = df.iloc[kw_pos]
+                search_kw = kw_row['keyword']
+                
+                attr_data = pd.DataFrame({
+                    "Platform": ["Google AIO", "ChatGPT", "Gemini", "Perplexity"],
+                    "Probability": [kw_row['AI Overview'], kw_row['ChatGPT'], kw_row['Gemini'], kw_row['Perplexity']]
+                })
+                
+                fig_radar = px.line_polar(attr_data, r='Probability', theta='Platform', line_close=True, 
+                                        template=PLOT_THEME, title=f"AI Footprint: {search_kw}")
+                fig_radar.update_traces(fill='toself')
+                st.plotly_chart(fig_radar, use_container_width=True)
 
-        with g_tab4:
+        @fragment
+        def ai_ranking_blueprint():
             st.subheader("🏆 TMU AI Ranking Protocols")
             st.write("Specific protocols to outrank competitors on AI Search.")
             sc1, sc2 = st.columns(2)
@@ -813,25 +1092,35 @@ elif main_nav == MOD_GROWTH:
                 st.info("✨ **Google AIO / Gemini**")
                 st.markdown("- The **'Quick Answer'** box.\n- Structured table schema.\n- Direct outcome language.")
 
-        with g_tab5:
+        @fragment
+        def data_science_modeling():
             st.subheader("🔬 Advanced Data Science Modeling")
             st.markdown("Deep-dive analytics using clustering and semantic density modeling.")
             
             ds_col1, ds_col2 = st.columns([1, 1])
-            with ds_col1:
+            with ds_col1, timed('chart', 'Growth / Topical sunburst', len(df)):
                 st.markdown("#### 🌪️ Topical Hierarchy (Sunburst)")
-                fig_sun = px.sunburst(df.head(200), path=['Intent', 'Market Segment', 'keyword'], 
-                                     values='Volume', color='Keyword Difficulty',
-                                     color_continuous_scale='RdBu',
-                                     template=PLOT_THEME, title="Semantic Flow Architecture")
+                def build_topical_sunburst(rows, theme):
+                    derive(df, 'Market Segment')
+                    return px.sunburst(df.head(rows), path=['Intent', 'Market Segment', 'keyword'], 
+                                       values='Volume', color='Keyword Difficulty',
+                                       color_continuous_scale='RdBu',
+                                       template=theme, title="Semantic Flow Architecture")
+
+                fig_sun = figure_cache.get_or_build(get_fingerprint(df), 'topical_sunburst', build_topical_sunburst,
+                                                    rows=200, theme=PLOT_THEME)
                 st.plotly_chart(fig_sun, use_container_width=True)
-            with ds_col2:
+            with ds_col2, timed('chart', 'Growth / Density heatmap', len(df)):
                 st.markdown("#### 🌡️ Opportunity Density Heatmap")
                 fig_heat = px.density_heatmap(df, x="Keyword Difficulty", y="Volume", 
                                              nbinsx=20, nbinsy=20, color_continuous_scale='Viridis',
                                              template=PLOT_THEME, title="Volume vs Difficulty Density")
                 st.plotly_chart(fig_heat, use_container_width=True)
 
+        lazy_tabs(["💎 Growth Opportunities", "📊 AI Share of Voice", "🤖 AIO Intelligence", "🏆 AI Ranking Blueprint", "🔬 Data Science Modeling"],
+                  [growth_opportunities, ai_share_of_voice, aio_intelligence, ai_ranking_blueprint, data_science_modeling],
+                  key="growth_tabs")
+
 elif main_nav == MOD_TECH:
     st.title("⚙️ Technical Site Health & Crawl Audit")
     
@@ -871,7 +1160,7 @@ elif main_nav == MOD_TECH:
         st.info("💡 **Expert Insight:** Googlebot is spending 45% of its time on faceted URL parameters. Recommend implementing **Dynamic Parameter Handling** in GSC to save crawl budget for Admissions pages.")
 
     elif technical_choice == "Global Health Audit":
-        t_tab1, t_tab2, t_tab3, t_tab4 = st.tabs(["🕷️ Crawl Performance", "🚨 Critical Detectors", "🚀 Core Web Vitals", "⚔️ Cannibalization"])
+        t_tab1, t_tab2, t_tab3, t_tab4 = profiled_tabs(["🕷️ Crawl Performance", "🚨 Critical Detectors", "🚀 Core Web Vitals", "⚔️ Cannibalization"])
         
         with t_tab1:
             st.subheader("Sitewide Crawl Performance (TMU-bot)")
@@ -1097,9 +1386,8 @@ Sitemap: https://tmu.ac.in/sitemap.xml
 
 elif main_nav == MOD_KEYWORD:
     st.title("🧠 Keyword, Intent & AI-Search Lab")
-    k_tab1, k_tab2, k_tab3, k_tab4, k_tab5 = st.tabs(["🗝️ Topical Authority", "🎯 Funnel & Entity IQ", "🤖 AEO Optimizer", "⚔️ Keyword Gap", "🕵️ Competitor Scraper Lab"])
-    
-    with k_tab5:
+    @fragment
+    def competitor_scraper_lab():
         st.subheader("🕵️ Real-time Competitor Keyword Scraper")
         st.markdown("Extract keywords directly from any URL without using expensive APIs.")
         
@@ -1154,28 +1442,37 @@ elif main_nav == MOD_KEYWORD:
                 st.error(f"Scraping Failed: {e}")
                 st.warning("The target site might be blocking automated requests. Try a different URL or check your internet connection.")
     
-    with k_tab1:
+    @fragment
+    def topical_authority():
         st.subheader("Keyword Topical Clustering")
         st.markdown("Visualizing how your keywords cluster into high-level topical authorities.")
         if not df.empty:
             # Create a simple clustering by Intent and Volume
-            fig_tree = px.treemap(df.head(100), path=[px.Constant("TMU Domain"), 'Intent', 'keyword'], 
-                                 values='Volume', color='Keyword Difficulty',
-                                 color_continuous_scale='Bluyl',
-                                 template=PLOT_THEME, title="Topical Authority Hierarchy")
-            st.plotly_chart(fig_tree, use_container_width=True)
+            with timed('chart', 'Keyword Lab / Topical treemap', len(df)):
+                def build_treemap(rows, theme):
+                    return px.treemap(df.head(rows), path=[px.Constant("TMU Domain"), 'Intent', 'keyword'], 
+                                      values='Volume', color='Keyword Difficulty',
+                                      color_continuous_scale='Bluyl',
+                                      template=theme, title="Topical Authority Hierarchy")
+
+                fig_tree = figure_cache.get_or_build(get_fingerprint(df), 'topical_treemap', build_treemap,
+                                                     rows=100, theme=PLOT_THEME)
+                st.plotly_chart(fig_tree, use_container_width=True)
             
             st.divider()
             st.markdown("#### ☁️ Keyword Density Cloud")
-            kw_text = " ".join(df['keyword'].head(100).astype(str))
-            wordcloud = WordCloud(width=800, height=400, background_color='white', colormap='magma').generate(kw_text)
-            st.image(wordcloud.to_array(), use_column_width=True)
+            with timed('chart', 'Keyword Lab / WordCloud', len(df)):
+                cloud_img = get_word_cloud(get_fingerprint(df), df)
+                if cloud_img is not None:
+                    st.image(cloud_img, use_column_width=True)
+                    st.caption("Term size reflects the total search volume of the keywords containing it.")
             
             st.info("💡 **Strategy:** The largest blocks and words represent your primary traffic drivers. Focus on 'Informational' clusters to boost AIO visibility.")
         else:
             st.info("Upload data to see topical clustering.")
         
-    with k_tab4:
+    @fragment
+    def keyword_gap():
         st.subheader("⚔️ Competitive Keyword Gap")
         st.markdown("Compare TMU performance against top rivals (Amity, LPU, Sharda).")
         
@@ -1206,6 +1503,7 @@ elif main_nav == MOD_KEYWORD:
             
         with g_col2:
             # Visualization of Gap Magnitude
+            fig_gap = px.bar(display_gap, x="Keyword", y=["TMU Rank", "Amity Rank"],
                             title="Position Gap (Lower is Better)", barmode="group",
                             template=PLOT_THEME, color_discrete_sequence=["#6366f1", "#f43f5e"])
             fig_gap.update_layout(yaxis=dict(autorange="reversed"))
@@ -1213,13 +1511,15 @@ elif main_nav == MOD_KEYWORD:
             
         st.warning(f"Action: Rivals have {len(display_gap[display_gap['Amity Rank'] < 10])} keywords in Top 10 that TMU is currently trailing.")
         
-    with k_tab2:
+    @fragment
+    def funnel_entity_iq():
         st.subheader("TMU Enrollment Funnel & Semantic Entities")
         col_f1, col_f2 = st.columns([2, 1])
         with col_f1:
             # Sankey Diagram: Search -> Leads -> Applicants -> Admissions
             st.markdown("#### 🏗️ Search-to-Enrollment Flow (Sankey)")
-            total_vol = df['Volume'].sum() if not df.empty else 100000
+            kpi = get_active_kpis(df)
+            total_vol = kpi['total_volume'] if not df.empty else 100000
             leads = total_vol * 0.05
             applicants = leads * 0.2
             admissions = applicants * 0.1
@@ -1262,13 +1562,14 @@ elif main_nav == MOD_KEYWORD:
             st.markdown("#### �📊 Intent Funnel")
             funnel_data = pd.DataFrame({
                 "Stage": ["Top (Awareness)", "Mid (Consideration)", "Bottom (Decision)"],
-                "Volume": [df[df['Intent']=='Informational']['Volume'].sum() if not df.empty else 50000, 
-                           df[df['Intent']=='Commercial']['Volume'].sum() if not df.empty else 15000, 
-                           df[df['Intent']=='Transactional']['Volume'].sum() if not df.empty else 5000]
+                "Volume": [kpi['intent_volume'].get('Informational', 0) if not df.empty else 50000, 
+                           kpi['intent_volume'].get('Commercial', 0) if not df.empty else 15000, 
+                           kpi['intent_volume'].get('Transactional', 0) if not df.empty else 5000]
             })
             st.plotly_chart(px.funnel(funnel_data, x='Volume', y='Stage', template=PLOT_THEME), use_container_width=True)
         
-    with k_tab3:
+    @fragment
+    def aeo_optimizer():
         st.subheader("AI Answer Engine Optimization (AEO)")
         st.markdown("Rephrasing keywords into conversational queries that trigger AI Overviews.")
         
@@ -1280,9 +1581,13 @@ elif main_nav == MOD_KEYWORD:
             st.markdown(f"3. **Direct Answer Target:** *'TMU is ranked as a top engineering university in Moradabad due to its NAAC A+ status...'*")
             st.info("Embedding these natural language patterns in your H3 tags increases AIO inclusion probability by ~35%.")
 
+    lazy_tabs(["🗝️ Topical Authority", "🎯 Funnel & Entity IQ", "🤖 AEO Optimizer", "⚔️ Keyword Gap", "🕵️ Competitor Scraper Lab"],
+              [topical_authority, funnel_entity_iq, aeo_optimizer, keyword_gap, competitor_scraper_lab],
+              key="keyword_lab_tabs")
+
 elif main_nav == MOD_CONTENT:
     st.title("📄 Content Intelligence & Strategy")
-    o_tab1, o_tab2, o_tab3, o_tab4, o_tab5 = st.tabs(["📝 Brief Generator", "💯 On-Page Score", "📐 Schema Builder", "🏗️ Entity Hub Planner", "🔗 Internal Link Optimizer"])
+    o_tab1, o_tab2, o_tab3, o_tab4, o_tab5 = profiled_tabs(["📝 Brief Generator", "💯 On-Page Score", "📐 Schema Builder", "🏗️ Entity Hub Planner", "🔗 Internal Link Optimizer"])
     
     with o_tab1:
         st.subheader("SEO Content Brief Generator (Writer Tool)")
@@ -1433,7 +1738,7 @@ elif main_nav == MOD_CONTENT:
 
 elif main_nav == MOD_AUTHORITY:
     st.title("🔗 Authority Builder & Backlink Engine")
-    a_tab1, a_tab2, a_tab3 = st.tabs(["🛡️ Backlink Monitor", "🚀 Outreach Finder", "☣️ Toxic Backlink Audit"])
+    a_tab1, a_tab2, a_tab3 = profiled_tabs(["🛡️ Backlink Monitor", "🚀 Outreach Finder", "☣️ Toxic Backlink Audit"])
     
     with a_tab1:
         st.subheader("Referring Domains & Velocity")
@@ -1489,7 +1794,7 @@ elif main_nav == MOD_AUTHORITY:
 
 elif main_nav == MOD_COMPETITIVE:
     st.title("⚔️ Competitive & Entity IQ")
-    c_tab1, c_tab2, c_tab3 = st.tabs(["📊 Market Comparison", "⚔️ Rival Site Intel", "🏛️ Entity Health"])
+    c_tab1, c_tab2, c_tab3 = profiled_tabs(["📊 Market Comparison", "⚔️ Rival Site Intel", "🏛️ Entity Health"])
     
     with c_tab1:
         st.subheader("Shared Keyword Gap")
@@ -1545,7 +1850,7 @@ elif main_nav == MOD_AI:
     st.title("🤖 AI SEO Co-Pilot (Cognitive Decision Engine)")
     st.markdown("Harness AI to determine your next 'Big Move' based on real-time domain authority and search patterns.")
     
-    a_tab1, a_tab2, a_tab3 = st.tabs(["🧠 Strategic Cognitive Audit", "🎯 Quadrant Analysis", "✨ AI Dominance Engine"])
+    a_tab1, a_tab2, a_tab3 = profiled_tabs(["🧠 Strategic Cognitive Audit", "🎯 Quadrant Analysis", "✨ AI Dominance Engine"])
     
     with a_tab1:
         target_url = st.text_input("Analyze URL", "https://tmu.ac.in/faculty-engineering")
@@ -1585,7 +1890,7 @@ elif main_nav == MOD_AI:
             q_df['Strategy Quadrant'] = pd.cut(q_df['Keyword Difficulty'], bins=[-1, 30, 70, 101], labels=['Quick Wins', 'Standard Competition', 'High Effort']).astype(str)
             
             qc1, qc2 = st.columns(2)
-            with qc1:
+            with qc1, timed('chart', 'AI Co-Pilot / Strategy quadrant', len(df)):
                 fig_quad = px.scatter(q_df.head(200), x='Keyword Difficulty', y='Volume', color='Strategy Quadrant',
                                     hover_name='keyword', size='Volume', template=PLOT_THEME, 
                                     title="Strategic Priority Quadrant")
@@ -1620,7 +1925,7 @@ elif main_nav == MOD_AI:
         st.caption("AI-identified keywords with the highest probability of Top 3 ranking in 30 days.")
         if not df.empty:
             # Recommending keywords: High Volume (>500) and Moderate Difficulty (<50)
-            gold_df = df[(df['Volume'] > 500) & (df['Keyword Difficulty'] < 50)].sort_values(by='Volume', ascending=False).head(5)
+            gold_df = engine.top_n('Volume', 5, where=[('Volume', '>', 500), ('Keyword Difficulty', '<', 50)])
             if not gold_df.empty:
                 for idx, row in gold_df.iterrows():
                     with st.container():
@@ -1651,7 +1956,7 @@ elif main_nav == MOD_LEAD:
     st.title("💎 Enterprise Lead & Authority Intelligence")
     st.markdown("Advanced techniques used by NAAC A+ organizations to capture high-intent leads and dominate semantic search.")
     
-    l_tab1, l_tab2, l_tab3, l_tab4 = st.tabs(["📱 Social Search SEO", "🎓 EEAT Authority Vault", "📉 Content Decay Radar", "🎯 Lead Conversion Lab"])
+    l_tab1, l_tab2, l_tab3, l_tab4 = profiled_tabs(["📱 Social Search SEO", "🎓 EEAT Authority Vault", "📉 Content Decay Radar", "🎯 Lead Conversion Lab"])
     
     with l_tab1:
         st.subheader("YouTube & Social Search Optimization")
@@ -1695,14 +2000,34 @@ elif main_nav == MOD_LEAD:
         st.subheader("📉 Content Decay & Renewal Radar")
         st.markdown("Identifying once-peak pages that are losing traffic and need 'Freshness' updates.")
         
-        decay_df = pd.DataFrame({
-            "Page URL": ["/admission-2023", "/engineering-syllabus-v1", "/medical-cutoff-old"],
-            "Traffic Peak": ["June 2023", "Aug 2023", "May 2023"],
-            "Current Drop": ["-84%", "-42%", "-91%"],
-            "Action": ["Redirect to 2024", "Update Content", "Delete/Merge"]
-        })
-        st.dataframe(decay_df, use_container_width=True, hide_index=True)
-        st.warning("⚠️ **Alert:** 12% of TMU traffic is currently coming from decaying pages. Update required to maintain authority.")
+        with db.read() as conn:
+            monthly = rollup_series(conn, project, grain='month', periods=12)
+            decaying = decaying_keywords(conn, project, days=90)
+
+        if len(monthly) >= 2:
+            fig_footprint = px.area(monthly, x='period_start', y='total_volume', line_shape="spline",
+                                    labels={'period_start': 'Month', 'total_volume': 'Search Volume'},
+                                    template=PLOT_THEME, title="12-Month Organic Footprint (Monthly Rollup)")
+            st.plotly_chart(fig_footprint, use_container_width=True)
+
+        if not decaying.empty:
+            st.dataframe(decaying, use_container_width=True, hide_index=True, column_config={
+                "Baseline Volume": st.column_config.NumberColumn(format="%d"),
+                "Current Volume": st.column_config.NumberColumn(format="%d"),
+                "Change %": st.column_config.NumberColumn(format="%.1f%%")
+            })
+            lost = int((decaying['Baseline Volume'] - decaying['Current Volume']).sum())
+            st.warning(f"⚠️ **Alert:** Top decaying keywords lost {lost:,} monthly searches over 90 days. Refresh the pages ranking for them.")
+        else:
+            decay_df = pd.DataFrame({
+                "Page URL": ["/admission-2023", "/engineering-syllabus-v1", "/medical-cutoff-old"],
+                "Traffic Peak": ["June 2023", "Aug 2023", "May 2023"],
+                "Current Drop": ["-84%", "-42%", "-91%"],
+                "Action": ["Redirect to 2024", "Update Content", "Delete/Merge"]
+            })
+            st.dataframe(decay_df, use_container_width=True, hide_index=True)
+            st.warning("⚠️ **Alert:** 12% of TMU traffic is currently coming from decaying pages. Update required to maintain authority.")
+            st.caption("Sample radar: save dated snapshots of this project to detect real keyword decay.")
 
     with l_tab4:
         st.subheader("🎯 Lead Conversion Optimization (CRO)")
@@ -1733,7 +2058,7 @@ elif main_nav == MOD_REPORT:
     gh3.metric("Content Maturity", "B+", "Stable")
     gh4.metric("Backlink Profile", "B", "-1%")
     
-    rep_tab1, rep_tab2, rep_tab3 = st.tabs(["🏛️ Global Health Radar", "📄 Executive Summaries", "💰 ROI & Traffic Value"])
+    rep_tab1, rep_tab2, rep_tab3 = profiled_tabs(["🏛️ Global Health Radar", "📄 Executive Summaries", "💰 ROI & Traffic Value"])
     
     with rep_tab1:
         st.subheader("SEO Health Radar")
@@ -1774,8 +2099,9 @@ elif main_nav == MOD_REPORT:
         
         if not df.empty:
             # Calculate Value: Volume * Avg CTR (3%) * Avg CPC
-            avg_cpc = df['CPC (INR)'].mean() if 'CPC (INR)' in df.columns else 45
-            total_monthly_vol = df['Volume'].sum()
+            kpi = get_active_kpis(df)
+            avg_cpc = kpi['avg_cpc'] if 'CPC (INR)' in df.columns else 45
+            total_monthly_vol = kpi['total_volume']
             est_organic_clicks = total_monthly_vol * 0.03
             monthly_traffic_value = est_organic_clicks * avg_cpc
             
@@ -1800,7 +2126,7 @@ elif main_nav == MOD_REPORT:
 
 elif main_nav == MOD_LOCAL:
     st.title("📍 TMU Local & Admissions Engine")
-    l_tab1, l_tab2 = st.tabs(["🏠 Google Business (Local Maps)", "📅 Admissions vs Search Traffic"])
+    l_tab1, l_tab2 = profiled_tabs(["🏠 Google Business (Local Maps)", "📅 Admissions vs Search Traffic"])
     
     with l_tab1:
         st.subheader("🏠 Google Business Profile (Local Pack)")
@@ -1849,6 +2175,20 @@ elif main_nav == MOD_TASK:
         if st.button("Annotate Charts"):
             st.success(f"Annotation logged for {date_change}")
 
+profiler.record('module', main_nav, len(df), time.perf_counter() - module_start)
+
+if profiler.ADMIN:
+    with st.sidebar.expander("⏱️ Render Profiler (Admin)"):
+        profiler.flush()
+        kind = st.selectbox("Section Type", ["All", "module", "tab", "chart", "table", "query", "feature", "load"])
+        timings = profiler.percentiles(kind=None if kind == "All" else kind)
+        st.caption(f"p50/p95 over the last {profiler.REPORT_DAYS} days, slowest first, per dataset size.")
+        st.dataframe(timings.round(1), use_container_width=True, hide_index=True)
+        if st.button("🗑️ Clear Samples"):
+            profiler.clear()
+            st.rerun()
+profiler.flush()
+
 # --- Footer ---
 st.divider()
 st.markdown("<center>TMU SEO Intelligence Suite v3.0 | Teerthanker Mahaveer University</center>", unsafe_allow_html=True)
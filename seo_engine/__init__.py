@@ -0,0 +1 @@
+"""Data layer and processing engine behind the TMU SEO Command Center."""
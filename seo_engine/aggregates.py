@@ -0,0 +1,127 @@
+"""Summary tables behind the KPI cards (Home, Reporting ROI, Intent Funnel).
+
+``keyword_summary`` keeps running totals per (source, intent, segment) for the
+latest version of every keyword in the master database. SQLite triggers keep it
+current on every insert, upsert and delete, so project KPIs are a lookup over a
+handful of rows no matter how large the database grows. ``summarize_frame``
+builds the same shape for an in-memory dataset, once per dataset.
+"""
+import pandas as pd
+
+HARD_KD = 80
+HIGH_VOLUME = 5000
+MEASURES = ['keywords', 'total_volume', 'kd_sum', 'cpc_sum', 'hard_kd', 'high_volume']
+
+# Contribution of one keyword row (alias ``r``) to its summary group, scaled by ``sign``
+_CONTRIBUTION = (
+    "{sign}, {sign} * COALESCE(r.volume, 0), {sign} * COALESCE(r.kd, 0), {sign} * COALESCE(r.cpc, 0), "
+    f"{{sign}} * COALESCE(r.kd > {HARD_KD}, 0), {{sign}} * COALESCE(r.volume > {HIGH_VOLUME}, 0)"
+)
+_NEWER_EXISTS = '''EXISTS (SELECT 1 FROM keywords n WHERE n.keyword = {row}.keyword
+                   AND n.source = {row}.source AND n.snapshot_date > {row}.snapshot_date)'''
+_PREVIOUS_VERSION = '''keywords r WHERE r.keyword = {row}.keyword AND r.source = {row}.source
+                       AND r.snapshot_date = (SELECT MAX(p.snapshot_date) FROM keywords p
+                                              WHERE p.keyword = {row}.keyword AND p.source = {row}.source
+                                              AND p.snapshot_date < {row}.snapshot_date)'''
+_TRACKED = ['volume', 'kd', 'cpc', 'intent', 'segment']
+
+
+def _apply(sign, source):
+    """Upsert a signed contribution into keyword_summary; ``source`` is a FROM/WHERE body with alias r."""
+    return f'''INSERT INTO keyword_summary (source, intent, segment, {', '.join(MEASURES)})
+               SELECT r.source, COALESCE(r.intent, ''), COALESCE(r.segment, ''), {_CONTRIBUTION.format(sign=sign)}
+               FROM {source}
+               ON CONFLICT (source, intent, segment) DO UPDATE SET
+               {', '.join(f'{m} = {m} + excluded.{m}' for m in MEASURES)};'''
+
+
+def _row(alias):
+    # Expose a trigger's NEW/OLD row under the alias ``r`` expected by _apply
+    columns = ', '.join(f"{alias}.{c} AS {c}" for c in ['source'] + _TRACKED)
+    return f"(SELECT {columns}) r WHERE 1"
+
+
+TRIGGERS = {
+    # A new latest version replaces the previous one in the totals
+    'trg_summary_insert': f'''CREATE TRIGGER IF NOT EXISTS trg_summary_insert AFTER INSERT ON keywords
+        WHEN NOT {_NEWER_EXISTS.format(row='NEW')}
+        BEGIN
+            {_apply(-1, _PREVIOUS_VERSION.format(row='NEW'))}
+            {_apply(1, _row('NEW'))}
+        END''',
+    'trg_summary_update': f'''CREATE TRIGGER IF NOT EXISTS trg_summary_update
+        AFTER UPDATE OF {', '.join(_TRACKED)} ON keywords
+        WHEN NOT {_NEWER_EXISTS.format(row='NEW')}
+         AND ({' OR '.join(f'OLD.{c} IS NOT NEW.{c}' for c in _TRACKED)})
+        BEGIN
+            {_apply(-1, _row('OLD'))}
+            {_apply(1, _row('NEW'))}
+        END''',
+    # Deleting a latest version makes the previous one current again
+    'trg_summary_delete': f'''CREATE TRIGGER IF NOT EXISTS trg_summary_delete AFTER DELETE ON keywords
+        WHEN NOT {_NEWER_EXISTS.format(row='OLD')}
+        BEGIN
+            {_apply(-1, _row('OLD'))}
+            {_apply(1, _PREVIOUS_VERSION.format(row='OLD'))}
+        END''',
+}
+
+
+def ensure_summary_schema(conn):
+    fresh = not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'keyword_summary'").fetchone()
+    conn.execute(f'''CREATE TABLE IF NOT EXISTS keyword_summary
+                 (source TEXT,
+                  intent TEXT,
+                  segment TEXT,
+                  {', '.join(f'{m} REAL DEFAULT 0' for m in MEASURES)},
+                  PRIMARY KEY (source, intent, segment))''')
+    if fresh:
+        conn.execute(_apply(1, "latest_keywords r WHERE 1"))
+    for sql in TRIGGERS.values():
+        conn.execute(sql)
+
+
+def read_summary(conn, sources=None, intents=None):
+    where, params = "WHERE keywords > 0", []
+    for column, values in (('source', sources), ('intent', intents)):
+        if values:
+            where += f" AND {column} IN ({', '.join('?' * len(values))})"
+            params += list(values)
+    return pd.read_sql_query(f"SELECT * FROM keyword_summary {where}", conn, params=params)
+
+
+def summarize_frame(df):
+    """Summary groups for an in-memory processed frame (same columns as keyword_summary)."""
+    if df.empty:
+        return pd.DataFrame(columns=['intent', 'segment'] + MEASURES)
+    segment = df['Market Segment'] if 'Market Segment' in df.columns else pd.Series('', index=df.index)
+    cpc = df['CPC (INR)'] if 'CPC (INR)' in df.columns else pd.Series(0.0, index=df.index)
+    parts = pd.DataFrame({
+        # astype(object) first: categorical labels reject a fill value outside their categories
+        'intent': df['Intent'].astype(object).fillna('').astype(str),
+        'segment': segment.astype(object).fillna('').astype(str),
+        'keywords': 1,
+        'total_volume': df['Volume'],
+        'kd_sum': df['Keyword Difficulty'],
+        'cpc_sum': cpc,
+        'hard_kd': (df['Keyword Difficulty'] > HARD_KD).astype(int),
+        'high_volume': (df['Volume'] > HIGH_VOLUME).astype(int)
+    })
+    return parts.groupby(['intent', 'segment'], as_index=False, observed=True)[MEASURES].sum()
+
+
+def kpis(summary):
+    """KPI values from a summary frame: totals, averages and per-intent volumes."""
+    totals = summary[MEASURES].sum()
+    count = totals['keywords']
+    by_intent = summary.groupby('intent')[['keywords', 'total_volume']].sum()
+    return {
+        'keywords': int(count),
+        'total_volume': float(totals['total_volume']),
+        'avg_kd': float(totals['kd_sum'] / count) if count else 0.0,
+        'avg_cpc': float(totals['cpc_sum'] / count) if count else 0.0,
+        'hard_kd': int(totals['hard_kd']),
+        'high_volume': int(totals['high_volume']),
+        'intent_keywords': by_intent['keywords'].to_dict(),
+        'intent_volume': by_intent['total_volume'].to_dict()
+    }
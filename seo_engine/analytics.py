@@ -0,0 +1,130 @@
+"""Pluggable analytics backends for the module aggregations.
+
+Modules ask an engine for the handful of shapes they render: top-N tables,
+column totals and means, and group-by sums. ``PandasEngine`` runs them on the
+session's in-memory frame and stays the default. ``DuckDBEngine`` runs the same
+calls as vectorized SQL over that frame, which is scanned in place without a
+copy.
+
+DuckDB (with pyarrow) is optional: ``engine_for`` only picks it when it is
+installed and the frame is large (``DUCKDB_MIN_ROWS``), or when
+``SEO_ANALYTICS_ENGINE`` forces it. Filters are ``(column, op, value)`` tuples so both engines share one spec.
+
+Given ``rankings`` (score column -> ``seo_engine.ranking.RankingIndex``), the
+pandas engine answers ``top_n`` from precomputed orderings instead of sorting
+the frame on every call.
+"""
+import operator
+import os
+
+import pandas as pd
+
+try:
+    import duckdb
+    import pyarrow as pa
+except ImportError:
+    duckdb = None
+
+DUCKDB_MIN_ROWS = 250_000
+ENGINE_SETTING = os.environ.get('SEO_ANALYTICS_ENGINE', 'auto')   # auto | pandas | duckdb
+OPERATORS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le, '==': operator.eq, '!=': operator.ne}
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class PandasEngine:
+    name = 'pandas'
+
+    def __init__(self, df, rankings=None):
+        self.df = df
+        self.rankings = rankings
+
+    def _filtered(self, where):
+        if not where:
+            return self.df
+        mask = pd.Series(True, index=self.df.index)
+        for column, op, value in where:
+            mask &= OPERATORS[op](self.df[column], value)
+        return self.df[mask]
+
+    def top_n(self, by, n, columns=None, where=None):
+        if self.rankings is not None:
+            return self.rankings(by).top(self.df, n, columns, where)
+        top = self._filtered(where).sort_values(by=by, ascending=False).head(n)
+        return top[columns] if columns else top
+
+    def total(self, column, where=None):
+        return float(self._filtered(where)[column].sum())
+
+    def means(self, columns):
+        return self.df[columns].mean()
+
+    def group_sum(self, by, measures, where=None):
+        frame = self._filtered(where)
+        # Missing labels form their own group, as in SQL GROUP BY
+        return frame.groupby(by, as_index=False, observed=True, dropna=False)[measures].sum()
+
+
+class DuckDBEngine:
+    name = 'duckdb'
+
+    def __init__(self, connection, relation='keywords', frame=None):
+        self.con = connection
+        self.relation = relation
+        self.frame = frame
+        self._registered = None
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls(duckdb.connect(), frame=df)
+
+    def _query(self, sql, params=()):
+        # The frame is handed over as an Arrow table (zero-copy for numerics and Arrow strings, and
+        # far faster to scan than the pandas object); rebuilt when derive() adds a column
+        if self.frame is not None and self._registered != list(self.frame.columns):
+            self.con.register(self.relation, pa.Table.from_pandas(self.frame, preserve_index=False))
+            self._registered = list(self.frame.columns)
+        return self.con.execute(sql, list(params))
+
+    def _where(self, where):
+        if not where:
+            return '', []
+        clauses = [f"{_quote(column)} {'=' if op == '==' else op} ?" for column, op, _ in where]
+        return 'WHERE ' + ' AND '.join(clauses), [value for _, _, value in where]
+
+    def _select(self, columns):
+        return ', '.join(_quote(c) for c in columns) if columns else '*'
+
+    def top_n(self, by, n, columns=None, where=None):
+        clause, params = self._where(where)
+        sql = (f"SELECT {self._select(columns)} FROM {self.relation} {clause} "
+               f"ORDER BY {_quote(by)} DESC NULLS LAST LIMIT {int(n)}")
+        return self._query(sql, params).df()
+
+    def total(self, column, where=None):
+        clause, params = self._where(where)
+        value = self._query(f"SELECT SUM({_quote(column)}) FROM {self.relation} {clause}", params).fetchone()[0]
+        return float(value or 0)
+
+    def means(self, columns):
+        row = self._query(f"SELECT {', '.join(f'AVG({_quote(c)})' for c in columns)} FROM {self.relation}").fetchone()
+        return pd.Series(row, index=columns, dtype='float64')
+
+    def group_sum(self, by, measures, where=None):
+        by = [by] if isinstance(by, str) else list(by)
+        clause, params = self._where(where)
+        keys = ', '.join(_quote(c) for c in by)
+        sums = ', '.join(f"SUM({_quote(m)}) AS {_quote(m)}" for m in measures)
+        return self._query(f"SELECT {keys}, {sums} FROM {self.relation} {clause} GROUP BY {keys} ORDER BY {keys}",
+                           params).df()
+
+
+def engine_for(df, setting=ENGINE_SETTING, rankings=None):
+    """The analytics engine for a session frame: pandas unless DuckDB is available and pays off.
+
+    ``rankings`` only applies to the pandas engine; DuckDB already answers ORDER BY ... LIMIT with a top-N heap.
+    """
+    use_duckdb = duckdb is not None and (setting == 'duckdb' or (setting == 'auto' and len(df) >= DUCKDB_MIN_ROWS))
+    return DuckDBEngine.from_frame(df) if use_duckdb else PandasEngine(df, rankings)
@@ -0,0 +1,79 @@
+"""Parallel multi-file ingestion for weekly export batches.
+
+Every file in a batch (one export per program: BCA, MBBS, B.Tech, ...) is
+sniffed, parsed and normalized in its own worker process, then the results
+are merged in upload order. Cross-file duplicates are dropped with a 64-bit
+hash of the normalized keyword (casefolded, whitespace collapsed), so the
+same query exported by two programs is kept once. A file that fails to parse
+is reported and skipped; it does not sink the batch.
+"""
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from seo_engine.importer import read_normalized
+from seo_engine.processing import normalize_seo_frame
+
+REPORT_COLUMNS = ['file', 'rows', 'kept', 'duplicates', 'seconds', 'error']
+
+
+def parse_file(name, data):
+    """Worker: ``(name, normalized frame or None, seconds, error)`` for one uploaded file."""
+    start = time.perf_counter()
+    try:
+        if name.lower().endswith(('.xlsx', '.xls')):
+            df = normalize_seo_frame(pd.read_excel(io.BytesIO(data)))
+        else:
+            df = read_normalized(io.BytesIO(data))
+        return name, df, time.perf_counter() - start, None
+    except Exception as e:
+        return name, None, time.perf_counter() - start, str(e)
+
+
+def keyword_hashes(keywords):
+    """64-bit hashes of the normalized keyword: casefolded, whitespace collapsed."""
+    normalized = keywords.astype(str).str.casefold().str.split().str.join(' ')
+    return pd.util.hash_pandas_object(normalized, index=False)
+
+
+def _parse_all(files, max_workers):
+    if len(files) == 1 or max_workers == 1:
+        return [parse_file(name, data) for name, data in files]
+    # spawn: the Streamlit server is multi-threaded, so forking it is unsafe
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+        return list(pool.map(parse_file, *zip(*files)))
+
+
+def ingest_batch(files, max_workers=None):
+    """Parse ``[(name, bytes), ...]`` in parallel and merge with cross-file dedupe.
+
+    Returns ``(merged_frame, report)``; the report has one row per file plus the wall time
+    of the whole batch in ``report.attrs['wall_seconds']``.
+    """
+    start = time.perf_counter()
+    max_workers = max_workers or min(len(files), os.cpu_count() or 1)
+    results = _parse_all(files, max_workers)
+
+    seen, frames, rows = set(), [], []
+    for name, df, seconds, error in results:
+        if df is None:
+            rows.append({'file': name, 'rows': 0, 'kept': 0, 'duplicates': 0, 'seconds': seconds, 'error': error})
+            continue
+        hashes = keyword_hashes(df['keyword']).to_numpy()
+        # First occurrence wins, both within the file and across earlier files
+        keep = ~pd.Series(hashes).duplicated().to_numpy()
+        keep &= ~pd.Series(hashes).isin(seen).to_numpy()
+        seen.update(hashes[keep].tolist())
+        frames.append(df[keep])
+        rows.append({'file': name, 'rows': len(df), 'kept': int(keep.sum()),
+                     'duplicates': int(len(df) - keep.sum()), 'seconds': seconds, 'error': error})
+
+    merged = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    report = pd.DataFrame(rows, columns=REPORT_COLUMNS)
+    report.attrs['wall_seconds'] = time.perf_counter() - start
+    return merged, report
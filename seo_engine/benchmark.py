@@ -0,0 +1,156 @@
+"""Benchmark harness for the processing pipeline and module aggregations.
+
+Run ``python -m seo_engine.benchmark`` from the repository root. For each
+size (1k, 10k, 100k and 1M rows by default) it generates a synthetic export
+with ``seo_engine.synthetic`` and times every stage behind ``load_tmu_data``
+and the module screens. That covers CSV parsing, normalization, variant
+collapsing, the full ``process_seo_dataframe``, segmentation fit and predict,
+derived metrics, and the top-N, total, mean and group-by calls the Home,
+Growth and AI Dominance modules make through the analytics engine. The
+module calls are timed again on a pandas engine backed by ranking indexes
+(``ranked:`` stages), after a ``ranking_build`` stage that sorts them.
+
+Each stage runs twice. The first run is timed. The second runs under
+``tracemalloc`` and records peak Python/numpy allocation; Arrow string
+buffers are allocated outside the Python heap and are not counted. Results
+are appended to ``benchmark_results.csv`` with the processing code version, and the
+printout compares every stage with the previous recorded run of the same size,
+so regressions stand out.
+"""
+import argparse
+import io
+import os
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+from seo_engine.aggregates import summarize_frame
+from seo_engine.analytics import engine_for
+from seo_engine.cache import PROCESSING_VERSION, dataset_fingerprint
+from seo_engine.canonical import collapse_variants
+from seo_engine.features import FEATURES, derive
+from seo_engine.importer import read_normalized
+from seo_engine.processing import normalize_seo_frame, process_seo_dataframe
+from seo_engine.ranking import RankingIndex, RankingIndexes
+from seo_engine.segmentation import fit, predict
+from seo_engine.synthetic import synthetic_export
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RESULTS_PATH = 'benchmark_results.csv'
+RESULT_COLUMNS = ['run_at', 'version', 'rows', 'stage', 'engine', 'seconds', 'peak_mb']
+PLATFORM_COLUMNS = ['ChatGPT', 'Gemini', 'Perplexity', 'AI Overview']
+RANKED_COLUMNS = ['Volume', 'Growth Priority', 'Booster Score', 'AI Overview']
+
+
+def _measure(stage, *args):
+    """``(result, seconds, peak_mb)``: one timed call, then one call under tracemalloc."""
+    start = time.perf_counter()
+    result = stage(*args)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    try:
+        stage(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak / 2 ** 20
+
+
+def _derive_all(df):
+    # A copy per call: derive() memoizes in place and the second run must start cold
+    return derive(df.copy(), *FEATURES)
+
+
+def _module_stages(engine):
+    """The aggregations each module screen issues, keyed by ``module/chart``."""
+    return {
+        'home/pareto': lambda: (engine.top_n('Volume', 20, ['keyword', 'Volume']), engine.total('Volume')),
+        'growth/priority_top15': lambda: engine.top_n('Growth Priority', 15),
+        'growth/platform_means': lambda: engine.means(PLATFORM_COLUMNS),
+        'growth/aio_leaders': lambda: engine.top_n('AI Overview', 12),
+        'growth/booster_top10': lambda: engine.top_n('Booster Score', 10),
+        'growth/intent_volume': lambda: engine.group_sum('Intent', ['Volume']),
+        'ai/gold_tier': lambda: engine.top_n('Volume', 5, where=[('Volume', '>', 500), ('Keyword Difficulty', '<', 50)]),
+    }
+
+
+def run_size(rows, seed=0):
+    """Result rows (dicts without ``run_at``/``version``) for one dataset size."""
+    raw = synthetic_export(rows, seed=seed)
+    csv_bytes = raw.to_csv(index=False).encode()
+    results = []
+
+    def record(stage, engine, fn, *args):
+        value, seconds, peak_mb = _measure(fn, *args)
+        results.append({'rows': rows, 'stage': stage, 'engine': engine, 'seconds': seconds, 'peak_mb': peak_mb})
+        return value
+
+    record('parse_csv', 'pandas', lambda: read_normalized(io.BytesIO(csv_bytes)))
+    normalized = record('normalize', 'pandas', normalize_seo_frame, raw)
+    record('collapse_variants', 'pandas', collapse_variants, normalized)
+    df = record('process_seo_dataframe', 'pandas', process_seo_dataframe, raw)
+    # Fitted and predicted here rather than through assign_segments, which would persist a model file
+    model = record('segmentation_fit', 'sklearn', fit, df)
+    df['Market Segment'] = pd.Categorical(record('segmentation_predict', 'numpy', predict, model, df))
+    df = record('derived_metrics', 'pandas', _derive_all, df)
+    record('kpi_summary', 'pandas', summarize_frame, df)
+
+    engine = engine_for(df)
+    for stage, fn in _module_stages(engine).items():
+        record(stage, engine.name, fn)
+
+    record('ranking_build', 'numpy', lambda: [RankingIndex(df[c]) for c in RANKED_COLUMNS])
+    rankings = RankingIndexes().for_dataset(dataset_fingerprint(df), df)
+    for column in RANKED_COLUMNS:
+        rankings(column)
+    ranked = engine_for(df, 'pandas', rankings=rankings)
+    for stage, fn in _module_stages(ranked).items():
+        record(f"ranked:{stage}", 'pandas', fn)
+    return results
+
+
+def read_results(path=RESULTS_PATH):
+    return pd.read_csv(path) if os.path.exists(path) else pd.DataFrame(columns=RESULT_COLUMNS)
+
+
+def append_results(results, path=RESULTS_PATH):
+    frame = pd.DataFrame(results, columns=RESULT_COLUMNS)
+    frame.to_csv(path, mode='a', header=not os.path.exists(path), index=False, float_format='%.6g')
+    return frame
+
+
+def compare(current, previous):
+    """``current`` with the previous run's seconds/peak for the same size and stage, and the time ratio."""
+    if previous.empty:
+        return current.assign(prev_seconds=float('nan'), prev_peak_mb=float('nan'), ratio=float('nan'))
+    last = previous[previous['run_at'] == previous['run_at'].max()]
+    merged = current.merge(last[['rows', 'stage', 'seconds', 'peak_mb']].rename(
+        columns={'seconds': 'prev_seconds', 'peak_mb': 'prev_peak_mb'}), on=['rows', 'stage'], how='left')
+    return merged.assign(ratio=merged['seconds'] / merged['prev_seconds'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=RESULTS_PATH)
+    args = parser.parse_args(argv)
+
+    previous = read_results(args.output)
+    run_at = datetime.now().isoformat(timespec='seconds')
+    results = []
+    for rows in args.sizes:
+        print(f"Benchmarking {rows:,} rows...", flush=True)
+        results.extend({'run_at': run_at, 'version': PROCESSING_VERSION, **r} for r in run_size(rows, args.seed))
+
+    current = append_results(results, args.output)
+    report = compare(current, previous)
+    with pd.option_context('display.max_rows', None, 'display.width', 160):
+        print(report.drop(columns=['run_at', 'version']).round(4).to_string(index=False))
+    print(f"Appended {len(current)} results to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
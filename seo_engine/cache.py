@@ -0,0 +1,121 @@
+"""Content-hash keyed Parquet cache of processed datasets.
+
+A processed frame is stored under ``<content hash>-<code version>.parquet``.
+Re-opening an export that was already processed by the same processing code
+is a memory-mapped columnar read instead of a full parse and normalization
+pass. The code version hashes the source of the modules in
+``VERSIONED_MODULES``, so editing the pipeline invalidates old entries.
+"""
+import hashlib
+import os
+
+import pandas as pd
+
+from seo_engine import canonical, dtypes, importer, loaders, processing
+from seo_engine.features import FEATURES
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.seo_cache')
+MAX_CACHE_FILES = 32
+HASH_BLOCK = 1 << 20
+
+# Modules whose code determines the processed output; loaders and importer decide the column
+# mapping read_normalized produces for cached uploads
+VERSIONED_MODULES = (processing, canonical, dtypes, loaders, importer)
+
+
+def _code_version():
+    digest = hashlib.sha1()
+    for module in VERSIONED_MODULES:
+        with open(module.__file__, 'rb') as fh:
+            digest.update(fh.read())
+    return digest.hexdigest()[:12]
+
+PROCESSING_VERSION = _code_version()
+
+
+def content_hash(handle):
+    """BLAKE2 digest of a path or binary file-like object, read in blocks (the stream is rewound)."""
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(handle, (str, os.PathLike)):
+        with open(handle, 'rb') as fh:
+            for block in iter(lambda: fh.read(HASH_BLOCK), b''):
+                digest.update(block)
+    else:
+        handle.seek(0)
+        for block in iter(lambda: handle.read(HASH_BLOCK), b''):
+            digest.update(block)
+        handle.seek(0)
+    return digest.hexdigest()
+
+
+def dataset_fingerprint(df):
+    """Identity of an in-memory frame: shape, columns and a hash of every non-derived column.
+
+    It keys the shared dataset store, figure cache and ranking indexes, so two frames
+    that differ in any stored value (Intent, CPC, AI scores, ...) must not share it.
+    Lazily derived feature columns are ignored, so memoizing one does not change the identity.
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    columns = [c for c in df.columns if c not in FEATURES]
+    digest.update(repr((len(df), columns)).encode())
+    if columns and len(df):
+        try:
+            hashed = pd.util.hash_pandas_object(df[columns], index=False)
+        except TypeError:
+            # Unhashable cells (lists, dicts) in an object column: hash their text instead
+            hashed = pd.util.hash_pandas_object(df[columns].astype(str), index=False)
+        digest.update(hashed.values.tobytes())
+    return digest.hexdigest()
+
+
+def cache_key(handle):
+    return f"{content_hash(handle)}-{PROCESSING_VERSION}"
+
+
+def _path(key):
+    return os.path.join(CACHE_DIR, f"{key}.parquet")
+
+
+def load(key):
+    path = _path(key)
+    if not os.path.exists(path):
+        return None
+    try:
+        import pyarrow.parquet as pq
+        df = pq.read_table(path, memory_map=True).to_pandas()
+    except Exception:
+        return None
+    os.utime(path)  # mark as recently used for eviction
+    return df
+
+
+def save(key, df):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = _path(key) + '.tmp'
+        df.to_parquet(tmp_path, engine='pyarrow')
+        os.replace(tmp_path, _path(key))
+    except Exception:
+        # Unserializable frames (mixed-type object columns) or no pyarrow: just skip caching
+        return
+    _evict()
+
+
+def _evict():
+    entries = [os.path.join(CACHE_DIR, f) for f in os.listdir(CACHE_DIR) if f.endswith('.parquet')]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for stale in entries[MAX_CACHE_FILES:]:
+        os.remove(stale)
+
+
+def cached_process(handle, read):
+    """Processed frame for an export, reusing the cached result when these bytes were seen before.
+
+    ``read(handle)`` parses the raw export and is only called on a cache miss.
+    """
+    key = cache_key(handle)
+    df = load(key)
+    if df is None:
+        df = processing.process_seo_dataframe(read(handle))
+        save(key, df)
+    return df
@@ -0,0 +1,142 @@
+"""Keyword canonicalization and typo-level variant collapsing.
+
+Broad-match exports repeat one query many ways: "bca full form",
+"full form of bca", "BCA fullform". ``canonical_form`` folds case,
+punctuation, whitespace, common misspellings/abbreviations, filler words and
+token order, so those become one key. Question words are kept: "what is bca"
+is a different query from "bca". ``near_duplicate_groups`` then joins keys that
+differ by one typo in one token ("bca admision delhi" / "bca admission dehli").
+The keys must have the same token count and every other token equal. The
+differing pair must be one typo apart (see ``_is_typo``), share a first
+letter, be at least ``MIN_TYPO_CHARS`` long and contain no digits. So
+"bca college delhi" / "bca college ipu", "kanpur" / "kannur", "punjab" /
+"punjabi", "btech" / "mtech" and "bca 2024" / "bca 2025" stay apart.
+
+``process_seo_dataframe`` calls ``collapse_variants`` right after normalization,
+so every module sorts and charts the collapsed set. Each group keeps its
+highest-volume keyword as the representative, sums Volume across variants,
+and records the number of raw keywords in ``Variants``. Rows from different
+``source`` projects never merge. Collapsing an already-collapsed frame adds those counts, so it is safe to repeat. The master
+database stores raw rows on every save path (CSV, Excel and batch) and
+collapses when a dataset is read back for analysis.
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+STOPWORDS = {'a', 'an', 'the', 'of', 'for', 'in', 'on', 'to', 'and', 'is', 'with', 'at',
+             'ka', 'ki', 'ke', 'hai'}   # Hinglish queries: "bca ka full form"
+# Kept in canonical keys (they change the query), but too common to be useful as cloud terms
+QUESTION_WORDS = {'what', 'how', 'which', 'why', 'when', 'where', 'who', 'kya', 'kaise', 'kaun'}
+# Whole-token rewrites applied after punctuation is stripped
+VARIANTS = {
+    'fullform': 'full form', 'addmission': 'admission', 'admision': 'admission', 'admissions': 'admission',
+    'colleges': 'college', 'collage': 'college', 'universities': 'university', 'univ': 'university',
+    'uni': 'university', 'courses': 'course', 'cource': 'course', 'fee': 'fees', 'govt': 'government',
+    'pvt': 'private', 'eligiblity': 'eligibility', 'syllabuss': 'syllabus', 'scholarships': 'scholarship',
+}
+# "b tech" / "m sc" style degree abbreviations written with a space once dots are removed
+PUNCTUATION = re.compile(r'[^\w\s]+')
+DEGREE_SPLIT = re.compile(r'\b([bm]) (tech|sc|com|ed|pharm|arch|des|ba|ca)\b')
+
+MIN_TYPO_CHARS = 5            # shorter tokens (du/gu, mca/mba, data/date) only merge on an exact canonical match
+MIN_INDEL_CHARS = 6           # a letter more or less in a shorter word is often another word (hotel/hostel)
+MIN_SUBSTITUTION_CHARS = 8    # and so is one wrong letter (kanpur/kannur)
+
+
+def _canonical(keyword):
+    text = PUNCTUATION.sub(' ', keyword.casefold().replace('.', ''))
+    text = DEGREE_SPLIT.sub(r'\1\2', text)
+    tokens = []
+    for token in text.split():
+        tokens.extend(VARIANTS.get(token, token).split())
+    return ' '.join(sorted(t for t in tokens if t not in STOPWORDS) or tokens)
+
+
+def canonical_form(keywords):
+    """Canonical key per keyword: casefold, punctuation, variants, stopwords and token order folded."""
+    # Folded once per distinct raw keyword, then mapped back onto the rows
+    codes, uniques = pd.factorize(keywords.astype(str))
+    canonical = np.array([_canonical(u) for u in uniques], dtype=object)
+    return pd.Series(canonical[codes], index=keywords.index)
+
+
+def _is_typo(a, b):
+    """True when ``a`` and ``b`` are one typo apart.
+
+    Allowed: a plural ``s``, two swapped neighbours, a dropped or extra letter (words of
+    ``MIN_INDEL_CHARS`` or more) or one wrong letter (``MIN_SUBSTITUTION_CHARS`` or more). Other
+    edits to the last letter make a different word (punjab/punjabi, patna/patan), so they never count.
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    if len(b) - len(a) > 1 or a == b:
+        return False
+    if b == a + 's':
+        return True
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    last = len(b) - 1
+    if len(a) < len(b):
+        return i < last and len(a) >= MIN_INDEL_CHARS and a[i:] == b[i + 1:]
+    if i + 1 < last and a[i] == b[i + 1] and a[i + 1] == b[i] and a[i + 2:] == b[i + 2:]:
+        return True
+    return i < last and len(a) >= MIN_SUBSTITUTION_CHARS and a[i + 1:] == b[i + 1:]
+
+
+def _typo_token(token):
+    return len(token) >= MIN_TYPO_CHARS and not any(c.isdigit() for c in token)
+
+
+def near_duplicate_groups(keys):
+    """Group label per key joining keys that differ by a one-edit typo in one token (equal labels collapse)."""
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    keys = list(keys)
+    # Block on (the other tokens, first letter of the varying token): keys sharing a block have the
+    # same token count and differ in that one token only, so pairs are only compared inside a block
+    blocks = {}
+    for k, key in enumerate(keys):
+        tokens = key.split()
+        for i, token in enumerate(tokens):
+            if _typo_token(token):
+                rest = ' '.join(tokens[:i] + tokens[i + 1:])    # tokens are sorted, so this is order-free
+                blocks.setdefault((rest, token[0]), []).append((token, k))
+    pairs = [(a, b)
+             for members in blocks.values() if len(members) > 1
+             for n, (token_a, a) in enumerate(members)
+             for token_b, b in members[n + 1:]
+             if _is_typo(token_a, token_b)]
+    accepted = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+    graph = coo_matrix((np.ones(len(accepted)), (accepted[:, 0], accepted[:, 1])), shape=(len(keys), len(keys)))
+    return connected_components(graph, directed=False)[1]
+
+
+def collapse_variants(df):
+    """One row per canonical keyword group (per ``source``, when present), represented by its highest-volume variant."""
+    if df.empty or 'keyword' not in df.columns:
+        return df
+    canonical = canonical_form(df['keyword'])
+    key_index, keys = pd.factorize(canonical)
+    group = near_duplicate_groups(keys)[key_index]
+    if 'source' in df.columns:
+        # The same keyword in two projects is two rows of data, not a variant: never summed across sources
+        group = pd.DataFrame({'source': df['source'].to_numpy(), 'group': group}).groupby(
+            ['source', 'group'], sort=False, dropna=False).ngroup().to_numpy()
+
+    volume = pd.to_numeric(df['Volume'], errors='coerce').fillna(0) if 'Volume' in df.columns else pd.Series(0, index=df.index)
+    order = np.lexsort((-volume.to_numpy(), group))
+    first = np.r_[True, group[order][1:] != group[order][:-1]]
+    # Sorted positions keep the representatives in their original row order
+    representatives = np.sort(order[first])
+
+    collapsed = df.iloc[representatives].copy()
+    rep_groups = group[representatives]
+    if 'Volume' in df.columns:
+        collapsed['Volume'] = volume.groupby(group).sum().loc[rep_groups].to_numpy()
+    variants = df['Variants'].fillna(1) if 'Variants' in df.columns else pd.Series(1, index=df.index)
+    collapsed['Variants'] = variants.groupby(group).sum().loc[rep_groups].to_numpy()
+    return collapsed
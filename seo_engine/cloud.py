@@ -0,0 +1,64 @@
+"""Volume-weighted keyword cloud.
+
+``term_weights`` tokenizes every keyword in one vectorized pass and gives
+each term the total search volume of the keywords that contain it, so a term
+in a few high-volume queries outranks one repeated across long-tail noise.
+``render_cloud`` lays those weights out with
+``WordCloud.generate_from_frequencies``, skipping WordCloud's own text
+tokenizer. The dashboard caches the image per dataset fingerprint.
+"""
+import numpy as np
+import pandas as pd
+
+from seo_engine.canonical import QUESTION_WORDS, STOPWORDS
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+MAX_WORDS = 150
+MIN_TERM_CHARS = 2
+SEPARATOR_PATTERN = r'[^\p{L}\p{M}\p{N}]+'    # RE2: anything but letters, combining marks, digits
+# Python's re has no \p classes: word characters plus the Devanagari block for its vowel signs
+FALLBACK_TOKEN = r'(?:(?!_)[\w\u0900-\u097F])+'
+
+
+def _tokens(keywords):
+    """``(row, term code, vocabulary)`` for every token of every keyword, lowercased."""
+    if pa is not None:
+        # Arrow kernels: lowercase, split and flatten without a Python-level pass over the rows
+        text = pc.replace_substring_regex(pc.utf8_lower(pa.array(keywords.astype(str), type=pa.string())),
+                                          SEPARATOR_PATTERN, ' ')
+        lists = pc.utf8_split_whitespace(text)
+        encoded = pc.dictionary_encode(pc.list_flatten(lists))
+        return (pc.list_parent_indices(lists).to_numpy(), encoded.indices.to_numpy(),
+                encoded.dictionary.to_numpy(zero_copy_only=False))
+    tokens = keywords.astype(str).str.lower().str.findall(FALLBACK_TOKEN).reset_index(drop=True).explode().dropna()
+    codes, vocabulary = pd.factorize(tokens)
+    return tokens.index.to_numpy(), codes, vocabulary.to_numpy()
+
+
+def term_weights(df, max_words=MAX_WORDS, stopwords=STOPWORDS | QUESTION_WORDS):
+    """Top ``max_words`` terms by summed keyword Volume, as a Series (term -> volume)."""
+    if df.empty:
+        return pd.Series(dtype='float64')
+    rows, codes, vocabulary = _tokens(df['keyword'])
+    # A term counts once per keyword ("bca bca fees" adds its volume to "bca" once)
+    first = np.unique(rows.astype(np.int64) * len(vocabulary) + codes, return_index=True)[1]
+    rows, codes = rows[first], codes[first]
+    volume = pd.to_numeric(df['Volume'], errors='coerce').fillna(0).to_numpy(dtype='float64')
+    weights = pd.Series(np.bincount(codes, weights=volume[rows], minlength=len(vocabulary)), index=vocabulary)
+    keep = (weights > 0) & (weights.index.str.len() >= MIN_TERM_CHARS) & ~weights.index.isin(stopwords)
+    weights = weights[keep]
+    return weights.nlargest(max_words)
+
+
+def render_cloud(weights, width=800, height=400, colormap='magma'):
+    """RGB image array of the cloud for ``term_weights`` output."""
+    from wordcloud import WordCloud
+
+    cloud = WordCloud(width=width, height=height, background_color='white', colormap=colormap,
+                      max_words=len(weights) or 1)
+    return cloud.generate_from_frequencies(weights.to_dict()).to_array()
@@ -0,0 +1,99 @@
+"""Process-wide store of read-only datasets shared across sessions.
+
+Every Streamlit session used to keep its own copy of the active keyword frame
+and memoize derived columns into it, so N analysts on the same export held N
+copies. ``DatasetStore.acquire`` instead keeps one frozen *base* frame per
+dataset fingerprint and hands each session a ``DatasetHandle``:
+
+- ``handle.frame`` is a shallow view of the base. It shares every base column
+  array, and the base arrays are marked read-only, so an in-place write raises
+  instead of leaking into other sessions.
+- Columns a session adds (``derive`` features, ad-hoc assignments) land only
+  in its view. That per-session overlay is the only memory a session adds.
+- Acquiring a dataset already in the store returns the existing base. The
+  frame passed in is dropped, so its memory goes back as soon as the caller
+  lets go of it.
+
+Handles are reference counted. A base is evicted when its last handle is
+released, either explicitly or when the handle is garbage collected with the
+session state that held it.
+"""
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from seo_engine.cache import dataset_fingerprint
+
+
+def _frozen(df):
+    """``df`` rebuilt column by column over the same memory, with numpy buffers marked read-only."""
+    columns = {}
+    for name in df.columns:
+        values = df[name]
+        if isinstance(values.dtype, np.dtype):
+            array = values.to_numpy()
+            array.flags.writeable = False
+            columns[name] = array
+        else:
+            # Arrow strings are immutable already; categoricals are shared as-is
+            columns[name] = values.array
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+class DatasetHandle:
+    """A session's reference to a shared dataset; ``frame`` is its private view."""
+
+    def __init__(self, store, fingerprint, base):
+        self.fingerprint = fingerprint
+        self.frame = base.copy(deep=False)
+        self.base_columns = frozenset(base.columns)
+        self._finalizer = weakref.finalize(self, store._release, fingerprint)
+
+    def release(self):
+        """Drop this reference now rather than at garbage collection (idempotent)."""
+        self._finalizer()
+
+    @property
+    def overlay(self):
+        """Columns this session added on top of the shared base."""
+        return [c for c in self.frame.columns if c not in self.base_columns]
+
+
+class DatasetStore:
+    def __init__(self):
+        self._entries = {}     # fingerprint -> [base frame, reference count]
+        self._lock = threading.Lock()
+
+    def acquire(self, df, fingerprint=None):
+        """A new handle on ``df``'s dataset, sharing the stored base if one exists."""
+        fingerprint = fingerprint or dataset_fingerprint(df)
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                entry = self._entries[fingerprint] = [_frozen(df), 0]
+            entry[1] += 1
+            base = entry[0]
+        return DatasetHandle(self, fingerprint, base)
+
+    def _release(self, fingerprint):
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    del self._entries[fingerprint]
+
+    def stats(self):
+        """Datasets held, live handles and base bytes (shared, counted once)."""
+        with self._lock:
+            entries = list(self._entries.values())
+        return {
+            'datasets': len(entries),
+            'handles': sum(refs for _, refs in entries),
+            'bytes': int(sum(base.memory_usage(index=True, deep=True).sum() for base, _ in entries)),
+        }
+
+
+dataset_store = DatasetStore()
@@ -0,0 +1,65 @@
+"""Process-wide SQLite connection manager for the master database.
+
+One instance is shared by every Streamlit session (see ``get_db`` in app.py).
+The file runs in WAL mode so readers never block on an analyst's save: reads
+come from a small pool of query-only connections, and all writes go through a
+single dedicated writer connection serialized by a lock.
+"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from seo_engine.store import DB_PATH
+
+# Applied to every connection; journal_mode=WAL is persistent in the file header
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',       # durable at checkpoint, safe with WAL
+    'busy_timeout': 5000,          # ms to wait on a lock before raising
+    'cache_size': -64000,          # ~64 MB page cache per connection
+    'mmap_size': 268435456,        # 256 MB memory-mapped reads
+    'temp_store': 'MEMORY',
+}
+DEFAULT_READERS = 4
+
+
+def connect(path=DB_PATH, read_only=False):
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=PRAGMAS['busy_timeout'] / 1000)
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    if read_only:
+        conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+class ConnectionManager:
+    def __init__(self, path=DB_PATH, readers=DEFAULT_READERS):
+        self.path = path
+        self._writer = connect(path)
+        self._write_lock = threading.Lock()
+        self._readers = queue.Queue()
+        for _ in range(readers):
+            self._readers.put(connect(path, read_only=True))
+
+    @contextmanager
+    def read(self):
+        """Borrow a pooled read-only connection."""
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def write(self):
+        """Exclusive access to the writer; commits on success, rolls back on error."""
+        with self._write_lock:
+            with self._writer:
+                yield self._writer
+
+    def close(self):
+        with self._write_lock:
+            self._writer.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
@@ -0,0 +1,107 @@
+"""Compact in-memory dtypes for processed keyword frames.
+
+Every Streamlit session holds its own processed frame, so the default
+object/float64 layout is multiplied by the number of open sessions.
+``compact_frame`` applies ``DTYPE_PLAN``:
+
+- low-cardinality labels become ``category``;
+- keyword text becomes Arrow-backed ``string[pyarrow]`` when pyarrow is installed;
+- KD becomes ``uint8``, since it is an integer from 0 to 100 (clipped in ``normalize_seo_frame``);
+- 0-100 scores become ``float32``. This is safe under subtraction, unlike unsigned ints;
+- Volume and the ``Variants`` count become ``int32`` when they fit.
+
+CPC stays ``float64``. ``to_db_frame`` widens the float32 scores back to their
+shortest decimal before they are written to the master database. Derived
+metrics compute in float (see ``seo_engine.features``), so narrow integer
+inputs never wrap. ``memory_report`` shows the per-column footprint against the
+default layout.
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    TEXT_DTYPE = 'string[pyarrow]'
+except ImportError:
+    TEXT_DTYPE = 'string'
+
+CATEGORY_COLUMNS = ['Intent', 'Market Segment', 'source', 'SERP Features']
+TEXT_COLUMNS = ['keyword']
+UINT8_COLUMNS = ['Keyword Difficulty']
+FLOAT32_COLUMNS = ['SEO Score', 'AI Overview', 'ChatGPT', 'Gemini', 'Perplexity', 'Bing', 'Position',
+                   'Decay Risk', 'Entity Strength']
+INT32_COLUMNS = ['Volume', 'Variants']
+# Tighter than the dtype's own range: a KD above 100 stays float instead of passing as uint8
+VALUE_RANGES = {'Keyword Difficulty': (0, 100)}
+# Other text columns become categorical below this distinct/rows ratio
+CATEGORY_RATIO = 0.5
+
+DTYPE_PLAN = {
+    **{c: 'category' for c in CATEGORY_COLUMNS},
+    **{c: TEXT_DTYPE for c in TEXT_COLUMNS},
+    **{c: 'uint8' for c in UINT8_COLUMNS},
+    **{c: 'float32' for c in FLOAT32_COLUMNS},
+    **{c: 'int32' for c in INT32_COLUMNS},
+}
+
+
+def _fits(series, dtype, bounds=None):
+    values = series.to_numpy()
+    if np.isnan(values).any() or not np.array_equal(values, np.round(values)):
+        return False
+    info = np.iinfo(dtype)
+    low, high = bounds or (info.min, info.max)
+    return values.size == 0 or (values.min() >= low and values.max() <= high)
+
+
+def compact_column(col, series):
+    """``series`` cast per ``DTYPE_PLAN[col]``; unchanged if the cast would lose data."""
+    target = DTYPE_PLAN.get(col)
+    if target in ('uint8', 'int32'):
+        if pd.api.types.is_numeric_dtype(series) and _fits(series.astype('float64'), target, VALUE_RANGES.get(col)):
+            return series.astype(target)
+        if pd.api.types.is_float_dtype(series) and col in UINT8_COLUMNS:
+            return series.astype('float32')
+    elif target == 'float32':
+        if pd.api.types.is_numeric_dtype(series):
+            return series.astype('float32')
+    elif target is not None:
+        return series.astype(target)
+    elif series.dtype == object and len(series) and series.nunique() <= CATEGORY_RATIO * len(series):
+        return series.astype('category')
+    return series
+
+
+def compact_frame(df):
+    """``df`` with ``DTYPE_PLAN`` applied; columns that would lose data keep their dtype."""
+    df = df.copy(deep=False)
+    for col in df.columns:
+        df[col] = compact_column(col, df[col])
+    return df
+
+
+def _default_bytes(series):
+    """Bytes the column would take in pandas' default object/float64/int64 layout."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        sizes = series.cat.categories.to_series().map(sys.getsizeof).to_numpy()
+        codes = series.cat.codes.to_numpy()
+        return 8 * len(series) + int(sizes[codes[codes >= 0]].sum())
+    if pd.api.types.is_string_dtype(series.dtype) and series.dtype != object:
+        return int(series.astype(object).memory_usage(index=False, deep=True))
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return 8 * len(series)
+    return int(series.memory_usage(index=False, deep=True))
+
+
+def memory_report(df):
+    """Per-column dtype, current bytes and default-layout bytes, largest first."""
+    rows = [{
+        'column': col,
+        'dtype': str(df[col].dtype),
+        'bytes': int(df[col].memory_usage(index=False, deep=True)),
+        'default_bytes': _default_bytes(df[col]),
+    } for col in df.columns]
+    report = pd.DataFrame(rows, columns=['column', 'dtype', 'bytes', 'default_bytes'])
+    return report.sort_values('bytes', ascending=False, ignore_index=True)
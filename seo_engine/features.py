@@ -0,0 +1,117 @@
+"""Declarative registry of derived keyword metrics.
+
+Each derived column is registered with the columns it reads. ``derive``
+computes a column the first time a module asks for it and memoizes it on the
+frame itself (frames live in ``st.session_state``), so a module that never
+shows a metric never pays for it. Feature inputs may themselves be features;
+they are derived first.
+
+``set_column`` is the way to edit an input column: it assigns the values and
+drops every memoized column that depends on it, directly or transitively,
+leaving unrelated derived columns in place.
+"""
+from typing import Callable, NamedTuple
+
+import pandas as pd
+
+from seo_engine.dtypes import compact_column
+from seo_engine.profiler import timed
+from seo_engine.segmentation import assign_segments
+
+
+class Feature(NamedTuple):
+    name: str
+    inputs: tuple
+    compute: Callable
+
+
+FEATURES = {}
+
+
+def register(name, *inputs):
+    def decorator(compute):
+        FEATURES[name] = Feature(name, inputs, compute)
+        return compute
+    return decorator
+
+
+def _float(df, column):
+    # Volume is int32 and KD uint8 (seo_engine.dtypes): integer arithmetic on them can wrap
+    return df[column].astype('float64')
+
+
+# --- Predictive Modeling: Opportunity Score ---
+# Simplified Holt-Winters / Weighted Opportunity
+@register('Opportunity Score', 'Volume', 'Keyword Difficulty')
+def _opportunity_score(df):
+    return ((_float(df, 'Volume') * (100 - _float(df, 'Keyword Difficulty'))) / 100).round(2)
+
+
+# --- Content Decay Simulation (AI Insights) ---
+# Decay Score = High KD + Low current AI visibility = Needs Update
+@register('Decay Risk', 'Keyword Difficulty', 'AI Overview')
+def _decay_risk(df):
+    return (_float(df, 'Keyword Difficulty') * 0.7 - df['AI Overview'] * 0.3).clip(0, 100).round(1)
+
+
+# --- Entity Authority Score ---
+# High Volume + Branded (simulated if contains TMU)
+@register('Entity Strength', 'Volume', 'Keyword Difficulty')
+def _entity_strength(df):
+    return (_float(df, 'Volume') / (_float(df, 'Keyword Difficulty') + 1) * 1.5).clip(0, 100).round(1)
+
+
+# --- Advanced Data Modeling: Clustering ---
+# Persisted Volume/KD segmentation: predict-only between refits (see seo_engine.segmentation)
+@register('Market Segment', 'Volume', 'Keyword Difficulty')
+def _market_segment(df):
+    # Fits the first model when there is none, so the predict-only LookupError never applies here
+    return pd.Series(assign_segments(df), index=df.index)
+
+
+@register('Growth Priority', 'Volume', 'Keyword Difficulty')
+def _growth_priority(df):
+    return (_float(df, 'Volume') / (_float(df, 'Keyword Difficulty') + 1)).round(1)
+
+
+@register('Booster Score', 'Volume', 'AI Overview', 'Keyword Difficulty')
+def _booster_score(df):
+    return (_float(df, 'Volume') * df['AI Overview']) / (_float(df, 'Keyword Difficulty') + 10)
+
+
+def derive(df, *names):
+    """Add any of ``names`` missing from ``df`` (in place) and return ``df``."""
+    for name in names:
+        if name in df.columns or name not in FEATURES:
+            continue
+        feature = FEATURES[name]
+        derive(df, *feature.inputs)
+        # Timed per feature, so a first-time segmentation fit shows up in the render profiler
+        with timed('feature', name, len(df)):
+            df[name] = compact_column(name, feature.compute(df))
+    return df
+
+
+def dependents(column):
+    """Every registered feature that reads ``column``, directly or through another feature."""
+    found, frontier = set(), [column]
+    while frontier:
+        current = frontier.pop()
+        for feature in FEATURES.values():
+            if current in feature.inputs and feature.name not in found:
+                found.add(feature.name)
+                frontier.append(feature.name)
+    return found
+
+
+def invalidate(df, column):
+    """Drop memoized features that depend on ``column``; returns the dropped names."""
+    stale = [c for c in df.columns if c in dependents(column)]
+    df.drop(columns=stale, inplace=True)
+    return stale
+
+
+def set_column(df, column, values):
+    """Assign an input column and invalidate only its dependents."""
+    df[column] = values
+    return invalidate(df, column)
@@ -0,0 +1,63 @@
+"""Process-wide cache of built Plotly figures.
+
+Figures over the whole dataset (Pareto, sunbursts, treemap, segmentation
+scatter) depend only on the dataset and a few chart parameters, so they are
+built once per ``(dataset fingerprint, chart, params)`` and then shared by every
+session viewing that dataset. The cache is LRU with two caps: number of entries
+and total size, where size is a figure's JSON length measured once at insert.
+
+Built ``Figure`` objects are stored rather than their JSON: ``st.plotly_chart``
+takes a figure and serializes it itself, and rebuilding a figure from JSON
+repeats the Plotly validation the cache is there to skip. Cached figures are
+shared, so callers must not mutate them after ``get_or_build`` returns.
+"""
+import threading
+from collections import OrderedDict
+
+MAX_ENTRIES = 64
+MAX_BYTES = 64 * 2 ** 20
+
+
+class FigureCache:
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()     # key -> (figure, bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get_or_build(self, fingerprint, chart, build, **params):
+        """The cached figure for this dataset, chart and params; ``build(**params)`` on a miss."""
+        key = (fingerprint, chart, tuple(sorted(params.items())))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        # Built outside the lock: concurrent misses may both build, the last insert wins
+        figure = build(**params)
+        size = len(figure.to_json())
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size <= self.max_bytes:
+                self._entries[key] = (figure, size)
+                self._bytes += size
+                while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                    self._bytes -= self._entries.popitem(last=False)[1][1]
+        return figure
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._bytes, 'hits': self.hits, 'misses': self.misses}
+
+
+figure_cache = FigureCache()
@@ -0,0 +1,116 @@
+"""Streaming bulk importer for large SEMrush/Ahrefs exports.
+
+The format is sniffed once from the head of the file (see ``loaders``), then
+the file is parsed ``chunksize`` rows at a time, normalized with the same rules
+as ``process_seo_dataframe`` and upserted chunk by chunk inside a single
+transaction, so memory stays flat no matter how large the export is.
+"""
+import os
+from datetime import date, datetime
+
+import pandas as pd
+
+from seo_engine.loaders import csv_reader, sniff
+from seo_engine.processing import normalize_seo_frame
+from seo_engine.segmentation import MIN_ROWS, assign_segments, load_model, model_version, needs_refit, predict, refit
+from seo_engine.snapshots import record_snapshot
+from seo_engine.store import to_db_frame, write_rows
+
+DEFAULT_CHUNKSIZE = 50_000
+
+
+def _stream_size(handle):
+    try:
+        pos = handle.tell()
+        handle.seek(0, os.SEEK_END)
+        size = handle.tell()
+        handle.seek(pos)
+        return size
+    except (AttributeError, OSError):
+        return None
+
+
+def iter_normalized_chunks(handle, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield ``(normalized_chunk, fraction_read)`` for a CSV path or binary file-like object.
+
+    Raises ``loaders.UnsupportedExport`` before parsing anything if the format is not recognized.
+    """
+    if isinstance(handle, (str, os.PathLike)):
+        with open(handle, 'rb') as fh:
+            yield from iter_normalized_chunks(fh, chunksize)
+        return
+
+    sniffed = sniff(handle)
+    rename = sniffed.rename
+    size = _stream_size(handle)
+    with csv_reader(handle, sniffed, chunksize) as reader:
+        for chunk in reader:
+            fraction = min(handle.tell() / size, 1.0) if size else None
+            yield normalize_seo_frame(chunk, rename), fraction
+
+
+def read_normalized(handle, chunksize=DEFAULT_CHUNKSIZE):
+    """Normalized frame for a whole export, parsed chunk by chunk (no row cap)."""
+    chunks = [chunk for chunk, _ in iter_normalized_chunks(handle, chunksize)]
+    return pd.concat(chunks) if chunks else pd.DataFrame()
+
+
+def stream_import(conn, handle, source, chunksize=DEFAULT_CHUNKSIZE, progress=None, snapshot_date=None):
+    """Upsert an export into the master database chunk by chunk in one transaction.
+
+    ``progress`` is called as ``progress(fraction, rows_written)`` after every chunk;
+    ``fraction`` is ``None`` when the stream size is unknown. Returns the rows written.
+    """
+    snapshot_date = str(snapshot_date or date.today())
+    timestamp = datetime.now()
+    written = 0
+    with conn:
+        for chunk, fraction in iter_normalized_chunks(handle, chunksize):
+            try:
+                # Predict-only: a chunk is never a fair sample to fit on (see refit_segments)
+                chunk['Market Segment'] = assign_segments(chunk, fit_missing=False)
+            except LookupError:
+                pass  # no model yet: segment stays unset until relabel_segments runs with the first model
+            db_df = to_db_frame(chunk, source, snapshot_date, timestamp)
+            written += write_rows(conn, db_df)
+            if progress:
+                progress(fraction, written)
+        record_snapshot(conn, source, snapshot_date)
+    return written
+
+
+def refit_segments(conn, force=False):
+    """Refit the segmentation model on every latest keyword in the master database.
+
+    Runs when ``force`` is set or the database has outgrown the model (``segmentation.needs_refit``).
+    Returns the new model, or ``None`` when no refit was needed.
+    """
+    rows = conn.execute("SELECT COUNT(*) FROM latest_keywords").fetchone()[0]
+    if rows < MIN_ROWS or not (force or needs_refit(rows)):
+        return None
+    features = pd.read_sql_query('SELECT volume AS "Volume", kd AS "Keyword Difficulty" FROM latest_keywords', conn)
+    return refit(features)
+
+
+def relabel_segments(conn, model=None):
+    """Rewrite every stored ``segment`` with the labels of ``model`` (default: the saved model).
+
+    Rows saved before the first model, or under an older one, would otherwise keep NULL or
+    stale labels, and so would their ``keyword_summary`` groups (kept current by its update
+    trigger). The version last applied is recorded in ``segment_model``, so this is a single
+    lookup until the model changes. Returns the rows relabelled.
+    """
+    model = model or load_model()
+    if model is None:
+        return 0
+    version = model_version(model)
+    if conn.execute("SELECT 1 FROM segment_model WHERE version = ?", (version,)).fetchone():
+        return 0
+    rows = pd.read_sql_query('SELECT id, volume AS "Volume", kd AS "Keyword Difficulty" FROM keywords', conn)
+    labels = predict(model, rows) if len(rows) else []
+    with conn:
+        relabelled = conn.executemany("UPDATE keywords SET segment = ? WHERE id = ? AND segment IS NOT ?",
+                                      zip(labels, rows['id'].tolist(), labels)).rowcount
+        conn.execute("DELETE FROM segment_model")
+        conn.execute("INSERT INTO segment_model (version) VALUES (?)", (version,))
+    return relabelled
@@ -0,0 +1,146 @@
+"""Format-sniffing loader registry for keyword exports.
+
+``sniff`` reads the first ``SNIFF_BYTES`` of a file once and decides
+everything the parser needs up front: encoding (from the BOM, or the NUL
+pattern of BOM-less UTF-16), the header line (Keyword Planner puts a title
+preamble above it), the delimiter and which tool produced the export.
+
+Each entry in ``EXPORT_FORMATS`` carries a column map compiled once at import
+(lowercased source header -> canonical column), so parsing is a single
+``read_csv`` with a precomputed rename. A file whose header matches no known
+column raises ``UnsupportedExport`` straight away instead of being parsed
+again under other guesses.
+"""
+import codecs
+import csv
+import os
+from typing import NamedTuple
+
+import pandas as pd
+
+from seo_engine.processing import NORM_MAP
+
+SNIFF_BYTES = 4096
+DELIMITERS = ['\t', ',', ';', '|']
+KEYWORD_COLUMNS = {'keyword', 'keywords', 'query', 'queries', 'top queries', 'search term', 'search query'}
+MAX_PREAMBLE_LINES = 10
+
+BOMS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
+class UnsupportedExport(ValueError):
+    pass
+
+
+class ExportFormat(NamedTuple):
+    name: str
+    signature: frozenset    # lowercased header columns that identify the tool
+    columns: dict           # lowercased header column -> canonical column
+
+
+def _compile(extra=None):
+    columns = {k.lower(): v for k, v in NORM_MAP.items()}
+    columns.update({k.lower(): v for k, v in (extra or {}).items()})
+    return columns
+
+
+# Checked in order: most specific signature first, generic last
+EXPORT_FORMATS = [
+    ExportFormat('Google Search Console', frozenset({'clicks', 'impressions', 'ctr'}), _compile({
+        'Top queries': 'keyword', 'Query': 'keyword', 'Position': 'Position',
+    })),
+    ExportFormat('Google Keyword Planner', frozenset({'avg. monthly searches'}), _compile({
+        'Competition (indexed value)': 'Keyword Difficulty',
+        'Top of page bid (high range)': 'CPC (INR)',
+    })),
+    ExportFormat('Ahrefs', frozenset({'kd', 'current position'}), _compile({
+        'Current position': 'Position', 'KD': 'Keyword Difficulty', 'CPC': 'CPC (INR)',
+    })),
+    ExportFormat('Ahrefs', frozenset({'kd', 'volume'}), _compile({
+        'KD': 'Keyword Difficulty', 'CPC': 'CPC (INR)',
+    })),
+    ExportFormat('Semrush', frozenset({'keyword', 'search volume'}), _compile()),
+    ExportFormat('Semrush', frozenset({'keyword', 'keyword difficulty'}), _compile()),
+    ExportFormat('Generic', frozenset(), _compile()),
+]
+
+
+class Sniffed(NamedTuple):
+    format: ExportFormat
+    encoding: str
+    sep: str
+    skiprows: int
+    header: list
+
+    @property
+    def rename(self):
+        """Precomputed rename for this file's header (no per-chunk matching)."""
+        return {c: self.format.columns[c.strip().lower()] for c in self.header
+                if c.strip().lower() in self.format.columns}
+
+
+def _encoding(head):
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+    sample = head[:200]
+    if sample and sample.count(0) > len(sample) // 4:
+        # BOM-less UTF-16: the NUL half of each ASCII code unit gives away the byte order
+        return ('utf-16-le' if sample[1::2].count(0) > sample[0::2].count(0) else 'utf-16-be'), 0
+    return 'utf-8', 0
+
+
+def sniff_bytes(head):
+    encoding, bom = _encoding(head)
+    body = head[bom:]
+    if encoding.startswith('utf-16') and len(body) % 2:
+        body = body[:-1]
+    try:
+        text = body.decode(encoding.replace('-sig', ''), errors='strict' if len(head) < SNIFF_BYTES else 'ignore')
+    except UnicodeDecodeError as e:
+        raise UnsupportedExport(f"Not a text export ({encoding} decode failed: {e.reason})")
+    lines = text.splitlines()
+    if len(head) >= SNIFF_BYTES and len(lines) > 1:
+        lines = lines[:-1]  # last line may be cut mid-row
+
+    # Header: first line naming a keyword column (skips Keyword Planner's title rows)
+    for skiprows, line in enumerate(lines[:MAX_PREAMBLE_LINES]):
+        sep = max(DELIMITERS, key=line.count)
+        if not line.count(sep):
+            sep = ','
+        header = next(csv.reader([line], delimiter=sep), [])
+        if KEYWORD_COLUMNS & {c.strip().lower() for c in header}:
+            break
+    else:
+        skiprows = 0
+        line = lines[0] if lines else ''
+        sep = max(DELIMITERS, key=line.count) if any(d in line for d in DELIMITERS) else ','
+        header = next(csv.reader([line], delimiter=sep), [])
+
+    names = {c.strip().lower() for c in header}
+    fmt = next(f for f in EXPORT_FORMATS if f.signature <= names)
+    sniffed = Sniffed(fmt, encoding, sep, skiprows, header)
+    if not sniffed.rename:
+        raise UnsupportedExport(f"No known keyword export columns in header: {header[:8]}")
+    return sniffed
+
+
+def sniff(handle):
+    """Sniff a CSV path or binary file-like object (the stream is rewound)."""
+    if isinstance(handle, (str, os.PathLike)):
+        with open(handle, 'rb') as fh:
+            return sniff_bytes(fh.read(SNIFF_BYTES))
+    handle.seek(0)
+    head = handle.read(SNIFF_BYTES)
+    handle.seek(0)
+    return sniff_bytes(head)
+
+
+def csv_reader(handle, sniffed, chunksize=None):
+    """``read_csv`` configured from a sniff result; an iterator when ``chunksize`` is set."""
+    return pd.read_csv(handle, sep=sniffed.sep, encoding=sniffed.encoding, skiprows=sniffed.skiprows,
+                       thousands=',' if sniffed.sep != ',' else None, chunksize=chunksize)
@@ -0,0 +1,175 @@
+"""Versioned, run-once schema migrations for the master database.
+
+``migrate`` is called once per process when the shared connection manager is
+created (see ``get_db`` in app.py), not on every Streamlit rerun. Applied
+versions are recorded in ``schema_migrations`` and mirrored into
+``PRAGMA user_version`` so an up-to-date database costs a single pragma read.
+
+Each migration runs in its own ``BEGIN IMMEDIATE`` transaction and re-checks
+the version after taking the lock, so two processes starting together apply
+it exactly once. Steps stay idempotent because databases created by the older
+per-rerun bootstrap already carry some of these columns and indexes.
+
+Append new migrations to ``MIGRATIONS``; never edit or renumber applied ones.
+"""
+from seo_engine.aggregates import ensure_summary_schema
+from seo_engine.snapshots import ensure_snapshot_schema
+
+
+def _columns(conn, table):
+    return {r[1] for r in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def _add_column(conn, table, column, decl):
+    if column in _columns(conn, table):
+        return False
+    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+    return True
+
+
+def _core_tables(conn):
+    # The original keyword table, plus the project/task tables shipped in the checked-in database
+    conn.execute('''CREATE TABLE IF NOT EXISTS keywords
+                 (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                  keyword TEXT,
+                  volume REAL,
+                  kd REAL,
+                  intent TEXT,
+                  aio_score REAL,
+                  chatgpt_score REAL,
+                  gemini_score REAL,
+                  perplexity_score REAL,
+                  source TEXT,
+                  timestamp DATETIME)''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS projects (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    name TEXT NOT NULL,
+                    url TEXT NOT NULL,
+                    type TEXT,
+                    status TEXT DEFAULT 'active',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    project_id INTEGER,
+                    title TEXT NOT NULL,
+                    type TEXT,
+                    priority TEXT,
+                    status TEXT DEFAULT 'open',
+                    due_date DATE,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (project_id) REFERENCES projects (id)
+                )''')
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_tasks_project ON tasks (project_id, status)")
+
+
+def _keyword_natural_key(conn):
+    # Legacy databases predate the snapshot column: backfill it from the save timestamp
+    if _add_column(conn, 'keywords', 'snapshot_date', 'DATE'):
+        conn.execute("UPDATE keywords SET snapshot_date = date(timestamp)")
+    has_key = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ux_keywords_natural_key'"
+    ).fetchone()
+    if not has_key:
+        # Collapse rows duplicated by the old append-only save before enforcing the key
+        conn.execute("UPDATE keywords SET source = '' WHERE source IS NULL")
+        conn.execute("UPDATE keywords SET snapshot_date = date('now') WHERE snapshot_date IS NULL")
+        conn.execute('''DELETE FROM keywords WHERE id NOT IN
+                        (SELECT MAX(id) FROM keywords GROUP BY keyword, source, snapshot_date)''')
+        conn.execute("CREATE UNIQUE INDEX ux_keywords_natural_key ON keywords (keyword, source, snapshot_date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_keywords_source ON keywords (source, snapshot_date)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_keywords_intent ON keywords (intent)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_keywords_timestamp ON keywords (timestamp)")
+
+
+def _latest_view(conn):
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_keywords_volume ON keywords (volume)")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_keywords_kd ON keywords (kd)")
+    # Latest snapshot of every (keyword, source): what the dashboard reads by default.
+    # Correlated form so filters, ORDER BY and LIMIT push down onto the base indexes.
+    conn.execute("DROP VIEW IF EXISTS latest_keywords")
+    conn.execute('''CREATE VIEW latest_keywords AS
+                    SELECT k.* FROM keywords k
+                    WHERE NOT EXISTS (SELECT 1 FROM keywords newer
+                                      WHERE newer.keyword = k.keyword AND newer.source = k.source
+                                      AND newer.snapshot_date > k.snapshot_date)''')
+
+
+def _snapshot_history(conn):
+    _add_column(conn, 'keywords', 'position', 'REAL')
+    if _add_column(conn, 'keywords', 'last_seen', 'DATE'):
+        conn.execute("UPDATE keywords SET last_seen = snapshot_date")
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_keywords_last_seen ON keywords (source, last_seen)")
+    ensure_snapshot_schema(conn)
+
+
+def _kpi_summary(conn):
+    # Legacy rows never stored CPC; 10.0 is the value processing assumed for them
+    _add_column(conn, 'keywords', 'cpc', 'REAL DEFAULT 10.0')
+    _add_column(conn, 'keywords', 'segment', 'TEXT')
+    ensure_summary_schema(conn)
+
+
+def _retention_rules(conn):
+    # Per-project overrides of retention.DEFAULT_RULE; NULL monthly_months keeps monthly history forever
+    conn.execute('''CREATE TABLE IF NOT EXISTS retention_rules
+                 (source TEXT PRIMARY KEY,
+                  daily_days INTEGER NOT NULL,
+                  monthly_months INTEGER)''')
+
+
+def _superseded_history(conn):
+    # last_seen before a version's latest touch, restored if a same-day save supersedes it
+    _add_column(conn, 'keywords', 'prev_seen', 'DATE')
+
+
+def _segment_model(conn):
+    # Version of the segmentation model whose labels the stored segment column holds
+    conn.execute("CREATE TABLE IF NOT EXISTS segment_model (version TEXT PRIMARY KEY)")
+
+
+# (version, name, step) in apply order
+MIGRATIONS = [
+    (1, 'core tables', _core_tables),
+    (2, 'keyword natural key', _keyword_natural_key),
+    (3, 'latest keywords view', _latest_view),
+    (4, 'snapshot history', _snapshot_history),
+    (5, 'kpi summary', _kpi_summary),
+    (6, 'retention rules', _retention_rules),
+    (7, 'superseded history', _superseded_history),
+    (8, 'segment model', _segment_model),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Apply every pending migration; returns the versions applied by this call."""
+    if schema_version(conn) >= SCHEMA_VERSION:
+        return []
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute('''CREATE TABLE IF NOT EXISTS schema_migrations
+                 (version INTEGER PRIMARY KEY,
+                  name TEXT,
+                  applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
+    applied = []
+    for version, name, step in MIGRATIONS:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have applied it while we waited for the write lock
+            if schema_version(conn) >= version:
+                conn.rollback()
+                continue
+            step(conn)
+            conn.execute("INSERT OR REPLACE INTO schema_migrations (version, name) VALUES (?, ?)", (version, name))
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(version)
+    return applied
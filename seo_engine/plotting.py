@@ -0,0 +1,78 @@
+"""Large-data helpers for full-dataset scatter plots.
+
+A scatter of every keyword sends every row to the browser. Above
+``WEBGL_ROWS`` points the dashboard switches to WebGL (``scattergl``) and
+plots one of two reduced views:
+
+- ``density_sample``: a density-preserving sample. Rows are binned on a KD x
+  log-Volume grid and each occupied cell keeps a share proportional to its
+  count, but at least one point. Sparse regions and outliers therefore stay
+  visible while dense regions are thinned. The highest-volume keywords are
+  always kept.
+- ``grid_counts``: keyword counts per grid cell, computed here with numpy so
+  only the tiles reach the browser. Heatmap tiles cannot be selected, so the
+  tile view also carries an invisible marker at each occupied cell's center.
+
+``in_box`` returns the raw rows inside a selected region, so a box selection
+drills down to real points for that region only.
+"""
+import numpy as np
+
+WEBGL_ROWS = 5_000        # above this, full-dataset scatters render with WebGL
+SAMPLE_POINTS = 20_000    # points a sampled scatter ships to the browser
+DRILL_POINTS = 50_000     # cap for raw points in a drilled-down region
+GRID_BINS = 60
+TOP_POINTS = 200          # highest-volume keywords always kept in a sample
+
+
+def _log_volume(values):
+    return np.log10(np.clip(values, 0, None) + 1)
+
+
+def _cells(xv, yv, bins):
+    def index(v):
+        lo, hi = np.nanmin(v), np.nanmax(v)
+        scaled = (v - lo) / (hi - lo) if hi > lo else np.zeros_like(v)
+        return np.clip(np.nan_to_num(scaled * bins).astype(np.int64), 0, bins - 1)
+    return index(xv) * bins + index(yv)
+
+
+def density_sample(df, x, y, max_points=SAMPLE_POINTS, bins=GRID_BINS, top=TOP_POINTS, seed=0):
+    """At most about ``max_points`` rows of ``df`` with the 2D density of ``x`` vs log ``y`` preserved."""
+    if len(df) <= max_points:
+        return df
+    xv = df[x].to_numpy(dtype='float64')
+    yv = df[y].to_numpy(dtype='float64')
+    cells = _cells(xv, _log_volume(yv), bins)
+    # Random order within each cell; a cell keeps its first `quota` rows
+    order = np.lexsort((np.random.default_rng(seed).random(len(df)), cells))
+    sorted_cells = cells[order]
+    starts = np.flatnonzero(np.r_[True, sorted_cells[1:] != sorted_cells[:-1]])
+    counts = np.diff(np.r_[starts, len(order)])
+    budget = max(max_points - top, len(counts))
+    quota = np.maximum(1, np.floor(counts * budget / len(df))).astype(np.int64)
+    rank = np.arange(len(order)) - np.repeat(starts, counts)
+    keep = np.zeros(len(df), dtype=bool)
+    keep[order[rank < np.repeat(quota, counts)]] = True
+    if top:
+        keep[np.argpartition(-np.nan_to_num(yv), min(top, len(df) - 1))[:top]] = True
+    return df[keep]
+
+
+def grid_counts(df, x, y, bins=GRID_BINS):
+    """``(counts, x_centers, y_centers)`` of ``x`` vs log10(``y`` + 1); counts indexed [y, x]."""
+    counts, x_edges, y_edges = np.histogram2d(df[x].to_numpy(dtype='float64'),
+                                              _log_volume(df[y].to_numpy(dtype='float64')), bins=bins)
+    return counts.T, (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2
+
+
+def in_box(df, x, y, box, log_y=False):
+    """Rows of ``df`` inside a Plotly box selection ``{'x': [x0, x1], 'y': [y0, y1]}``.
+
+    With ``log_y`` the box's y range is in log10(``y`` + 1) units, as on the tile view.
+    """
+    x0, x1 = sorted(box['x'])
+    y0, y1 = sorted(box['y'])
+    if log_y:
+        y0, y1 = 10 ** y0 - 1, 10 ** y1 - 1
+    return df[df[x].between(x0, x1) & df[y].between(y0, y1)]
@@ -0,0 +1,88 @@
+"""Reusable SEO data processor shared by the dashboard and the bulk importer."""
+import pandas as pd
+
+from seo_engine.canonical import collapse_variants
+from seo_engine.dtypes import compact_frame
+from seo_engine.features import FEATURES
+
+EMPTY_COLUMNS = ['keyword', 'Volume', 'Keyword Difficulty', 'Intent', 'SEO Score', 'AI Overview', 'ChatGPT', 'Gemini', 'Bing', 'CPC (INR)']
+
+# UNIVERSAL NORMALIZATION (Semrush/Ahrefs/GSC)
+NORM_MAP = {
+    'Keyword': 'keyword', 'keyword': 'keyword', 'Queries': 'keyword',
+    'Search Volume': 'Volume', 'Volume': 'Volume', 'Avg. Monthly Searches': 'Volume', 'Avg. monthly searches': 'Volume',
+    'KD': 'Keyword Difficulty', 'Keyword Difficulty': 'Keyword Difficulty', 'Common KD': 'Keyword Difficulty', 'Difficulty': 'Keyword Difficulty',
+    'CPC': 'CPC (INR)', 'CPC (INR)': 'CPC (INR)', 'Cost Per Click': 'CPC (INR)',
+    'Intent': 'Intent', 'intent': 'Intent', 'User Intent': 'Intent',
+    'Position': 'Position', 'Current position': 'Position', 'Pos': 'Position'
+}
+
+REQUIRED_DEFAULTS = {
+    'Volume': 100,
+    'Keyword Difficulty': 50,
+    'Intent': 'Informational',
+    'SEO Score': 50,
+    'AI Overview': 40,
+    'ChatGPT': 30,
+    'Gemini': 35,
+    'Perplexity': 20,
+    'Bing': 25,
+    'CPC (INR)': 10
+}
+
+NUMERIC_TARGETS = ['Volume', 'Keyword Difficulty', 'CPC (INR)', 'SEO Score', 'ChatGPT', 'Gemini', 'Bing', 'AI Overview', 'Perplexity']
+
+
+# Lowercased source header -> canonical column, compiled once
+NORM_LOOKUP = {k.lower(): v for k, v in NORM_MAP.items()}
+
+
+def column_map(columns, lookup=NORM_LOOKUP):
+    return {c: lookup[c.lower()] for c in columns if isinstance(c, str) and c.lower() in lookup}
+
+
+def normalize_seo_frame(df, rename=None):
+    """Column mapping, required-column synthesis and numeric cleaning. Safe to run per chunk.
+
+    ``rename`` is a precomputed column map (from ``loaders.sniff``); otherwise it is
+    derived from ``df.columns`` with a case-insensitive lookup.
+    """
+    df = df.rename(columns=column_map(df.columns) if rename is None else rename)
+
+    # ENSURE REQUIRED COLUMNS (Synthesize if missing)
+    if 'keyword' not in df.columns:
+        df['keyword'] = 'Keyword ' + df.index.astype(str)
+    for col, default in REQUIRED_DEFAULTS.items():
+        if col not in df.columns:
+            df[col] = default
+
+    # CLEAN NUMERIC COLS
+    for col in NUMERIC_TARGETS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    # KD is a 0-100 percentage; out-of-range exports would not fit the uint8 dtype plan
+    df['Keyword Difficulty'] = df['Keyword Difficulty'].clip(0, 100)
+
+    # Rank is optional (broad-match exports have none): unparseable positions stay missing, not 0
+    if 'Position' in df.columns:
+        df['Position'] = pd.to_numeric(df['Position'], errors='coerce')
+
+    return df
+
+
+def process_seo_dataframe(df):
+    if df.empty:
+        return pd.DataFrame(columns=EMPTY_COLUMNS)
+
+    df = normalize_seo_frame(df)
+
+    # "bca full form" / "full form of bca" / "bca fullform" -> one keyword with their summed volume
+    df = collapse_variants(df)
+
+    # Derived metrics (Market Segment, Opportunity Score, ...) are computed lazily by
+    # seo_engine.features when a module first needs them; stale stored copies are dropped
+    df = df.drop(columns=[c for c in FEATURES if c in df.columns])
+
+    # Categoricals, Arrow strings and narrow numerics: each session holds its own copy
+    return compact_frame(df)
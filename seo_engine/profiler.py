@@ -0,0 +1,146 @@
+"""Render-time profiler for dashboard modules, tabs and chart/table builds.
+
+``timed`` wraps a hot section (a ``main_nav`` module, a tab body, a chart or
+table build, a SQLite read, a model fit) and records its wall time with the
+row count of the dataset it ran on. Samples are buffered in memory and
+written in one batch per rerun, or per fragment rerun, by ``flush`` into a
+local SQLite file (``METRICS_PATH``). It is separate from the master database,
+so profiling never waits on its write lock. ``percentiles`` reports p50/p95 per section and per
+dataset-size bucket for the admin panel.
+
+Set ``SEO_PROFILER=0`` to switch recording off and ``SEO_ADMIN=1`` to show the
+panel.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+METRICS_PATH = 'tmu_seo_metrics.db'
+ENABLED = os.environ.get('SEO_PROFILER', '1') != '0'
+ADMIN = os.environ.get('SEO_ADMIN') == '1'
+KEEP_DAYS = 30
+REPORT_DAYS = 7
+
+_samples = []
+_lock = threading.Lock()
+
+
+def size_bucket(rows):
+    """Power-of-ten bucket of a dataset size: 0, 1, 10, 100, 1000, ..."""
+    return 10 ** int(math.log10(rows)) if rows and rows > 0 else 0
+
+
+def bucket_label(bucket):
+    for factor, suffix in ((10 ** 6, 'M'), (10 ** 3, 'k')):
+        if bucket >= factor:
+            return f"{bucket // factor}{suffix}+"
+    return f"{bucket}+"
+
+
+def record(kind, section, rows, seconds):
+    if ENABLED:
+        with _lock:
+            _samples.append((datetime.now().isoformat(timespec='seconds'), kind, section,
+                             size_bucket(rows), int(rows or 0), seconds))
+
+
+@contextmanager
+def timed(kind, section, rows=0, container=None):
+    """Time the ``with`` body; enters ``container`` (a tab, column, expander) around it if given."""
+    start = time.perf_counter()
+    try:
+        if container is None:
+            yield
+        else:
+            with container:
+                yield
+    finally:
+        record(kind, section, rows, time.perf_counter() - start)
+
+
+def timed_tabs(module, labels, tabs, rows=0):
+    """``st.tabs`` containers whose bodies are timed as ``<module> / <label>``."""
+    return [timed('tab', f"{module} / {label}", rows, tab) for label, tab in zip(labels, tabs)]
+
+
+def ensure_metrics_schema(conn):
+    conn.execute('''CREATE TABLE IF NOT EXISTS render_metrics
+                 (recorded_at TIMESTAMP,
+                  kind TEXT,
+                  section TEXT,
+                  size_bucket INTEGER,
+                  rows INTEGER,
+                  seconds REAL)''')
+    conn.execute("CREATE INDEX IF NOT EXISTS ix_render_metrics_recorded ON render_metrics (recorded_at)")
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=5)
+    conn.execute("PRAGMA journal_mode=WAL")
+    ensure_metrics_schema(conn)
+    return conn
+
+
+def flush(path=METRICS_PATH):
+    """Write buffered samples in one transaction and drop samples older than ``KEEP_DAYS``."""
+    with _lock:
+        batch = _samples[:]
+        del _samples[:]
+    if not batch:
+        return 0
+    conn = _connect(path)
+    try:
+        with conn:
+            conn.executemany("INSERT INTO render_metrics VALUES (?, ?, ?, ?, ?, ?)", batch)
+            cutoff = (datetime.now() - timedelta(days=KEEP_DAYS)).isoformat(timespec='seconds')
+            conn.execute("DELETE FROM render_metrics WHERE recorded_at < ?", (cutoff,))
+    finally:
+        conn.close()
+    return len(batch)
+
+
+def clear(path=METRICS_PATH):
+    with _lock:
+        del _samples[:]
+    conn = _connect(path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM render_metrics")
+    finally:
+        conn.close()
+
+
+def percentiles(path=METRICS_PATH, days=REPORT_DAYS, kind=None):
+    """p50/p95 milliseconds per kind, section and size bucket over the last ``days``, slowest p95 first."""
+    columns = ['kind', 'section', 'size', 'samples', 'p50_ms', 'p95_ms', 'max_ms']
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=columns)
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat(timespec='seconds')
+    conn = _connect(path)
+    try:
+        query = "SELECT kind, section, size_bucket, seconds FROM render_metrics WHERE recorded_at >= ?"
+        params = [cutoff]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        samples = pd.read_sql_query(query, conn, params=params)
+    finally:
+        conn.close()
+    if samples.empty:
+        return pd.DataFrame(columns=columns)
+    ms = samples['seconds'] * 1000
+    grouped = ms.groupby([samples['kind'], samples['section'], samples['size_bucket']])
+    report = pd.DataFrame({
+        'samples': grouped.size(),
+        'p50_ms': grouped.quantile(0.5),
+        'p95_ms': grouped.quantile(0.95),
+        'max_ms': grouped.max(),
+    }).reset_index()
+    report['size'] = report.pop('size_bucket').map(bucket_label)
+    return report[columns].sort_values('p95_ms', ascending=False, ignore_index=True)
@@ -0,0 +1,98 @@
+"""Precomputed ranking indexes for the dashboard's top-N leaderboards.
+
+Growth Priority, Booster Score, Pareto volume, the AI Dominance gold tier and
+the AIO leaders are all "top N rows by one score", asked again on every rerun.
+A ``RankingIndex`` holds the row positions of a frame sorted by one score,
+descending. It is sorted once per dataset, and after that a leaderboard is a
+slice of it:
+
+- Unfiltered top N: take the first N positions.
+- Filtered top N (for example Volume > 500 and KD < 50): test the filter on
+  the ranked positions in growing chunks and stop once N rows pass. The cost
+  depends on how deep the Nth match is, not on the size of the frame, and
+  nothing is sorted again.
+
+``RankingIndexes`` keeps the indexes of the most recent datasets process-wide,
+keyed by ``(dataset fingerprint, score column)``. A new or changed dataset
+gets a new fingerprint, so its indexes are rebuilt on first use. Derived
+scores are pure functions of the dataset, so sessions with their own
+``derive`` overlays share one index. Positions refer to row order, which every
+view of a dataset shares (see ``seo_engine.datasets``).
+
+``RankingIndexes.for_dataset`` is what ``analytics.engine_for`` takes as
+``rankings``.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from seo_engine.analytics import OPERATORS
+
+MAX_DATASETS = 8
+FIRST_CHUNK = 256
+
+
+class RankingIndex:
+    def __init__(self, values):
+        # Stable descending order with NaN last, matching sort_values(ascending=False) on the score
+        scores = -np.asarray(values, dtype='float64')
+        order = np.argsort(scores, kind='stable')
+        self.order = order.astype(np.int32) if len(order) < 2 ** 31 else order
+        self.rows = len(order)
+
+    def positions(self, frame, n, where=None):
+        """Row positions of the top ``n`` rows of ``frame`` that pass the ``where`` filters."""
+        if not where:
+            return self.order[:n]
+        tests = [(frame[column].to_numpy(), OPERATORS[op], value) for column, op, value in where]
+        found, start, chunk = [], 0, max(FIRST_CHUNK, 4 * n)
+        while start < self.rows and sum(map(len, found)) < n:
+            candidates = self.order[start:start + chunk]
+            mask = np.ones(len(candidates), dtype=bool)
+            for values, test, value in tests:
+                mask &= test(values[candidates], value)
+            found.append(candidates[mask])
+            start += chunk
+            chunk *= 2
+        return np.concatenate(found)[:n] if found else self.order[:0]
+
+    def top(self, frame, n, columns=None, where=None):
+        top = frame.iloc[self.positions(frame, n, where)]
+        return top[columns] if columns else top
+
+
+class RankingIndexes:
+    def __init__(self, max_datasets=MAX_DATASETS):
+        self.max_datasets = max_datasets
+        self._datasets = OrderedDict()     # fingerprint -> {score column: RankingIndex}
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint, frame, by):
+        """The index of ``frame`` by ``by``, built on first use for this dataset."""
+        with self._lock:
+            indexes = self._datasets.get(fingerprint)
+            if indexes is not None:
+                self._datasets.move_to_end(fingerprint)
+                index = indexes.get(by)
+                if index is not None and index.rows == len(frame):
+                    return index
+        # Sorted outside the lock: concurrent first requests may both build, the last insert wins
+        index = RankingIndex(frame[by])
+        with self._lock:
+            self._datasets.setdefault(fingerprint, {})[by] = index
+            self._datasets.move_to_end(fingerprint)
+            while len(self._datasets) > self.max_datasets:
+                self._datasets.popitem(last=False)
+        return index
+
+    def for_dataset(self, fingerprint, frame):
+        """``by -> RankingIndex`` lookup for one dataset, as taken by ``PandasEngine``."""
+        return lambda by: self.get(fingerprint, frame, by)
+
+    def clear(self):
+        with self._lock:
+            self._datasets.clear()
+
+
+ranking_indexes = RankingIndexes()
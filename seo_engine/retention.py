@@ -0,0 +1,166 @@
+"""Retention policy for keyword history and snapshot stats.
+
+Each project (``source``) keeps every daily version for ``daily_days``; older
+superseded versions are thinned to one per calendar month, the version in
+effect at month end, and dropped entirely once older than
+``monthly_months`` (``None`` keeps monthly history forever). The latest
+version of a keyword is never removed here; that is what "Wipe" is for.
+Daily ``snapshots`` and weekly rollups follow the daily window, monthly
+rollups the monthly one.
+
+Deletes run in short chunked write transactions so saves and reads interleave
+with a long purge, and freed pages are returned to the filesystem with
+``PRAGMA incremental_vacuum``. That needs the file in ``auto_vacuum=INCREMENTAL``
+mode. Switching to it rewrites the whole file with a full ``VACUUM``, so
+``ensure_incremental_vacuum`` only runs as an explicit admin action, never in the
+background. A daemon thread started by ``start_background`` applies the rules
+periodically.
+"""
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+DEFAULT_RULE = {'daily_days': 90, 'monthly_months': None}
+CHUNK_SIZE = 5000
+VACUUM_PAGES = 2000                 # pages released per incremental_vacuum call
+RETENTION_INTERVAL = 6 * 60 * 60    # seconds between background passes
+
+# Superseded versions outside the daily window that are not their month's closing version
+# (or that fall outside the monthly window altogether)
+EXPIRED_SQL = '''
+    WITH versions AS (
+        SELECT id, last_seen,
+               LEAD(snapshot_date) OVER (PARTITION BY keyword ORDER BY snapshot_date) AS next_date,
+               ROW_NUMBER() OVER (PARTITION BY keyword, strftime('%Y-%m', snapshot_date)
+                                  ORDER BY snapshot_date DESC) AS month_rank
+        FROM keywords WHERE source = :source
+    )
+    SELECT id FROM versions
+    WHERE next_date IS NOT NULL AND COALESCE(last_seen, next_date) < :daily_cutoff
+      AND (month_rank > 1 OR (:monthly_cutoff IS NOT NULL AND COALESCE(last_seen, next_date) < :monthly_cutoff))
+    ORDER BY id
+'''
+
+
+def get_rule(conn, source):
+    row = conn.execute("SELECT daily_days, monthly_months FROM retention_rules WHERE source = ?", (source,)).fetchone()
+    return dict(zip(DEFAULT_RULE, row)) if row else dict(DEFAULT_RULE)
+
+
+def set_rule(conn, source, daily_days, monthly_months=None):
+    conn.execute('''INSERT INTO retention_rules (source, daily_days, monthly_months) VALUES (?, ?, ?)
+                    ON CONFLICT(source) DO UPDATE SET daily_days = excluded.daily_days,
+                                                      monthly_months = excluded.monthly_months''',
+                 (source, int(daily_days), None if monthly_months is None else int(monthly_months)))
+
+
+def cutoffs(rule, today=None):
+    today = today or date.today()
+    daily = today - timedelta(days=rule['daily_days'])
+    monthly = None
+    if rule['monthly_months'] is not None:
+        month_index = daily.year * 12 + daily.month - 1 - rule['monthly_months']
+        monthly = date(month_index // 12, month_index % 12 + 1, 1)
+    return str(daily), None if monthly is None else str(monthly)
+
+
+def expired_versions(conn, source, rule, today=None):
+    daily, monthly = cutoffs(rule, today)
+    rows = conn.execute(EXPIRED_SQL, {'source': source, 'daily_cutoff': daily, 'monthly_cutoff': monthly})
+    return [r[0] for r in rows]
+
+
+def ensure_incremental_vacuum(manager):
+    """Switch the file to auto_vacuum=INCREMENTAL; needs one full VACUUM the first time."""
+    with manager.write() as conn:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        conn.commit()
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+    return True
+
+
+def reclaim(manager, pages=VACUUM_PAGES):
+    """Release free pages in small steps; returns the number of pages released."""
+    released = 0
+    while True:
+        with manager.write() as conn:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                return released
+            free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if not free:
+                return released
+            conn.execute(f"PRAGMA incremental_vacuum({pages})").fetchall()
+            left = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        released += free - left
+        if left >= free:
+            return released
+
+
+def apply_retention(manager, sources=None, today=None, chunk_size=CHUNK_SIZE):
+    """Apply each project's rule; returns {source: {'versions': n, 'snapshots': n}}."""
+    with manager.read() as conn:
+        if sources is None:
+            sources = [r[0] for r in conn.execute("SELECT DISTINCT source FROM keywords")]
+        plans = {}
+        for source in sources:
+            rule = get_rule(conn, source)
+            plans[source] = (cutoffs(rule, today), expired_versions(conn, source, rule, today))
+
+    report = {}
+    for source, ((daily, monthly), ids) in plans.items():
+        for start in range(0, len(ids), chunk_size):
+            with manager.write() as conn:
+                conn.executemany("DELETE FROM keywords WHERE id = ?", ((i,) for i in ids[start:start + chunk_size]))
+        with manager.write() as conn:
+            snapshots = conn.execute("DELETE FROM snapshots WHERE source = ? AND snapshot_date < ?",
+                                     (source, daily)).rowcount
+            conn.execute("DELETE FROM snapshot_rollups WHERE source = ? AND grain = 'week' AND period_start < ?",
+                         (source, daily))
+            if monthly is not None:
+                conn.execute("DELETE FROM snapshot_rollups WHERE source = ? AND grain = 'month' AND period_start < ?",
+                             (source, monthly))
+        report[source] = {'versions': len(ids), 'snapshots': snapshots}
+    return report
+
+
+class RetentionWorker:
+    """Daemon thread applying retention every ``interval`` seconds."""
+
+    def __init__(self, manager, interval=RETENTION_INTERVAL):
+        self.manager = manager
+        self.interval = interval
+        self.last_run = None
+        self.last_error = None
+        self._thread = threading.Thread(target=self._loop, name='seo-retention', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _loop(self):
+        while True:
+            try:
+                apply_retention(self.manager)
+                reclaim(self.manager)
+                self.last_error = None
+            except Exception as exc:
+                # Keep the worker alive; the next pass retries
+                self.last_error = str(exc)
+            self.last_run = datetime.now()
+            time.sleep(self.interval)
+
+
+def start_background(manager, interval=RETENTION_INTERVAL):
+    return RetentionWorker(manager, interval).start()
+
+
+def file_stats(manager):
+    with manager.read() as conn:
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        pages = conn.execute("PRAGMA page_count").fetchone()[0]
+        free = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    return {'size_mb': pages * page_size / 1e6, 'free_mb': free * page_size / 1e6,
+            'auto_vacuum': {0: 'NONE', 1: 'FULL', 2: 'INCREMENTAL'}.get(mode, mode)}
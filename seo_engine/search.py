@@ -0,0 +1,94 @@
+"""Search-as-you-type keyword finder backed by an in-memory SQLite FTS5 trigram index.
+
+Queries shorter than three characters use a NOCASE prefix index; longer ones
+match substrings through the trigram index (prefix hits ranked first). When
+there are too few hits, trigram-overlap fuzzy matching fills the list, which
+catches misspellings and reordered words.
+"""
+import sqlite3
+import threading
+from collections import Counter
+
+import pandas as pd
+
+FUZZY_CANDIDATES = 200
+FUZZY_THRESHOLD = 0.3
+FUZZY_GRAMS = 6           # rarest query trigrams used to gather candidates
+MAX_POSTINGS = 5000       # trigrams in more keywords than this are too common to be selective
+RESULT_COLUMNS = ['pos', 'keyword', 'Volume', 'match']
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _quote(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+class KeywordSearchIndex:
+    """Index over a keyword column; results carry ``pos``, the row's position in the source frame."""
+
+    def __init__(self, keywords, volumes=None):
+        volumes = volumes if volumes is not None else [0] * len(keywords)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self._conn.execute("CREATE TABLE kw (pos INTEGER PRIMARY KEY, keyword TEXT, volume REAL)")
+        self._conn.executemany("INSERT INTO kw VALUES (?, ?, ?)",
+                               ((i, str(k), float(v)) for i, (k, v) in enumerate(zip(keywords, volumes))))
+        self._conn.execute("CREATE INDEX ix_kw_prefix ON kw (keyword COLLATE NOCASE)")
+        self._conn.execute("CREATE INDEX ix_kw_volume ON kw (volume)")
+        self._conn.execute('''CREATE VIRTUAL TABLE kw_fts USING fts5
+                              (keyword, content='kw', content_rowid='pos', tokenize='trigram')''')
+        self._conn.execute("INSERT INTO kw_fts (kw_fts) VALUES ('rebuild')")
+        self._conn.execute("CREATE VIRTUAL TABLE kw_vocab USING fts5vocab(kw_fts, 'row')")
+
+    def search(self, query, limit=25):
+        """Top ``limit`` matches for ``query``; an empty query returns the highest-volume keywords."""
+        q = ' '.join(str(query or '').lower().split())
+        with self._lock:
+            if not q:
+                rows = self._conn.execute("SELECT pos, keyword, volume, 'top' FROM kw ORDER BY volume DESC LIMIT ?",
+                                          (limit,)).fetchall()
+            elif len(q) < 3:
+                rows = self._conn.execute('''SELECT pos, keyword, volume, 'prefix' FROM kw
+                                             WHERE keyword LIKE ? ESCAPE '\\' ORDER BY volume DESC LIMIT ?''',
+                                          (self._like_prefix(q), limit)).fetchall()
+            else:
+                rows = self._conn.execute('''SELECT kw.pos, kw.keyword, kw.volume,
+                                                    CASE WHEN kw.keyword LIKE ? ESCAPE '\\' THEN 'prefix' ELSE 'substring' END AS hit
+                                             FROM kw_fts JOIN kw ON kw.pos = kw_fts.rowid
+                                             WHERE kw_fts MATCH ?
+                                             ORDER BY hit = 'prefix' DESC, kw.volume DESC LIMIT ?''',
+                                          (self._like_prefix(q), _quote(q), limit)).fetchall()
+                if len(rows) < limit:
+                    rows += self._fuzzy(q, limit - len(rows), {r[0] for r in rows})
+        return pd.DataFrame(rows, columns=RESULT_COLUMNS)
+
+    @staticmethod
+    def _like_prefix(q):
+        return q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+    def _fuzzy(self, q, limit, seen):
+        grams = _trigrams(q)
+        # Gather candidates from the rarest query trigrams only, counting shared trigrams per keyword
+        doc_freq = dict(self._conn.execute(
+            f"SELECT term, doc FROM kw_vocab WHERE term IN ({', '.join('?' * len(grams))})", list(grams)))
+        usable = sorted(doc_freq, key=doc_freq.get)
+        selective = [g for g in usable if doc_freq[g] <= MAX_POSTINGS] or usable[:2]
+        overlap = Counter()
+        for gram in selective[:FUZZY_GRAMS]:
+            overlap.update(r[0] for r in self._conn.execute("SELECT rowid FROM kw_fts WHERE kw_fts MATCH ?", (_quote(gram),)))
+        positions = [pos for pos, _ in overlap.most_common(FUZZY_CANDIDATES) if pos not in seen]
+        if not positions:
+            return []
+        candidates = self._conn.execute(f"SELECT pos, keyword, volume FROM kw WHERE pos IN ({', '.join('?' * len(positions))})",
+                                        positions).fetchall()
+        scored = []
+        for pos, keyword, volume in candidates:
+            kw_grams = _trigrams(keyword.lower())
+            similarity = len(grams & kw_grams) / len(grams | kw_grams) if kw_grams else 0.0
+            if similarity >= FUZZY_THRESHOLD:
+                scored.append((similarity, volume, pos, keyword))
+        scored.sort(reverse=True)
+        return [(pos, keyword, volume, 'fuzzy') for _, volume, pos, keyword in scored[:limit]]
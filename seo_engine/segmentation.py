@@ -0,0 +1,139 @@
+"""Persisted Volume/KD market segmentation.
+
+The model (scaler statistics plus centroids) is saved to ``MODEL_PATH``, next
+to the master database. Datasets, upload chunks and imports only run
+``predict``: a nearest-centroid lookup in numpy, so loading data never pays
+for a clustering pass and the same keyword lands in the same "Market Segment"
+until the model is refitted.
+
+Refits happen on the master database as a whole (``importer.refit_segments``):
+after a save once it holds ``REFIT_GROWTH`` times the rows the model was fitted
+on, or from the admin maintenance panel. Streamed imports never fit on a single
+chunk. Before anything has been saved, the first dataset large enough to
+segment bootstraps the model.
+
+Centroids are sorted by their standardized Volume + KD position before
+labels are attached, so label order does not depend on the clustering's
+internal cluster ids. Large fits use ``MiniBatchKMeans`` on a deterministic
+sample; ``refit`` rebuilds the model explicitly.
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from seo_engine.store import DB_PATH
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(DB_PATH)), 'tmu_seo_segments.json')
+FEATURES = ['Volume', 'Keyword Difficulty']
+# Ascending by centroid position (standardized Volume + KD)
+SEGMENT_LABELS = ["Low Competition/Low Vol", "Niche Opportunities", "Growth Potentials",
+                  "High Value Targets", "Competitive Giants"]
+FALLBACK_LABEL = "General"
+MIN_ROWS = 6
+MINIBATCH_ROWS = 20_000     # above this, fit with MiniBatchKMeans
+FIT_SAMPLE = 200_000        # rows used to fit at most
+RANDOM_STATE = 42
+REFIT_GROWTH = 2.0          # refit once the master data has grown this many times past the fitted rows
+
+_lock = threading.Lock()
+_models = {}     # path -> loaded model
+
+
+def _features(df):
+    return df[FEATURES].fillna(0).to_numpy(dtype=np.float64)
+
+
+def fit(df):
+    """Fit scaler and centroids on ``df``; returns the model dict (not persisted)."""
+    from sklearn.cluster import KMeans, MiniBatchKMeans
+
+    X = _features(df)
+    if len(X) > FIT_SAMPLE:
+        X = X[np.random.default_rng(RANDOM_STATE).choice(len(X), FIT_SAMPLE, replace=False)]
+    mean = X.mean(axis=0)
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    Z = (X - mean) / scale
+    k = min(len(SEGMENT_LABELS), len(np.unique(Z, axis=0)))
+    if len(Z) > MINIBATCH_ROWS:
+        km = MiniBatchKMeans(n_clusters=k, random_state=RANDOM_STATE, batch_size=4096, n_init=3)
+    else:
+        km = KMeans(n_clusters=k, random_state=RANDOM_STATE, n_init=10)
+    km.fit(Z)
+    centroids = km.cluster_centers_[np.lexsort((km.cluster_centers_[:, 0], km.cluster_centers_.sum(axis=1)))]
+    labels = SEGMENT_LABELS if k == len(SEGMENT_LABELS) else [SEGMENT_LABELS[round(i * 4 / max(k - 1, 1))] for i in range(k)]
+    return {
+        'mean': mean.tolist(), 'scale': scale.tolist(), 'centroids': centroids.tolist(),
+        'labels': list(labels), 'rows': int(len(df)), 'fitted_at': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def model_version(model):
+    if model is None:
+        return 'none'
+    payload = json.dumps([model['mean'], model['scale'], model['centroids'], model['labels']]).encode()
+    return hashlib.sha1(payload).hexdigest()[:8]
+
+
+def load_model(path=MODEL_PATH):
+    if _models.get(path) is None and os.path.exists(path):
+        try:
+            with open(path) as fh:
+                _models[path] = json.load(fh)
+        except (OSError, ValueError):
+            return None
+    return _models.get(path)
+
+
+def save_model(model, path=MODEL_PATH):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as fh:
+        json.dump(model, fh)
+    os.replace(tmp_path, path)
+    _models[path] = model
+
+
+def refit(df, path=MODEL_PATH):
+    with _lock:
+        model = fit(df)
+        save_model(model, path)
+    return model
+
+
+def needs_refit(rows, path=MODEL_PATH):
+    """True when a dataset of ``rows`` keywords should replace the current model."""
+    if rows < MIN_ROWS:
+        return False
+    model = load_model(path)
+    return model is None or rows >= REFIT_GROWTH * model.get('rows', 0)
+
+
+def predict(model, df):
+    Z = (_features(df) - np.asarray(model['mean'])) / np.asarray(model['scale'])
+    centroids = np.asarray(model['centroids'])
+    # Squared distances to each centroid, without materializing an (n, k, 2) array
+    dist = (Z ** 2).sum(axis=1)[:, None] - 2 * Z @ centroids.T + (centroids ** 2).sum(axis=1)[None, :]
+    return np.asarray(model['labels'], dtype=object)[dist.argmin(axis=1)]
+
+
+def assign_segments(df, path=MODEL_PATH, fit_missing=True):
+    """'Market Segment' for every row; fits and persists the model if there is none yet.
+
+    With ``fit_missing=False`` (import chunks) a missing model raises ``LookupError`` instead.
+    """
+    model = load_model(path)
+    if model is None:
+        if not fit_missing:
+            raise LookupError("No segmentation model fitted yet")
+        if len(df) < MIN_ROWS:
+            return np.full(len(df), FALLBACK_LABEL, dtype=object)
+        with _lock:
+            model = load_model(path)
+            if model is None:
+                model = fit(df)
+                save_model(model, path)
+    return predict(model, df)
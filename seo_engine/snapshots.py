@@ -0,0 +1,120 @@
+"""Per-import snapshot stats, weekly/monthly rollups and the history series for trend charts.
+
+``record_snapshot`` runs at the end of every save. It summarizes the keywords
+present in that dated import into ``snapshots`` (one row per source and day)
+and refreshes the week and month containing it in ``snapshot_rollups``. The
+charts read these small tables instead of scanning raw keyword history.
+"""
+import pandas as pd
+
+# grain -> (period start expression, period length)
+ROLLUP_GRAINS = {
+    'week': ("date(:day, 'weekday 0', '-6 days')", '+7 days'),
+    'month': ("date(:day, 'start of month')", '+1 month'),
+}
+STAT_COLUMNS = ['keywords', 'top3', 'top10', 'top100', 'total_volume', 'avg_kd', 'avg_aio', 'volatility']
+
+
+def ensure_snapshot_schema(conn):
+    fresh = not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'snapshots'").fetchone()
+    conn.execute('''CREATE TABLE IF NOT EXISTS snapshots
+                 (source TEXT,
+                  snapshot_date DATE,
+                  keywords INTEGER,
+                  changed INTEGER,
+                  top3 INTEGER,
+                  top10 INTEGER,
+                  top100 INTEGER,
+                  total_volume REAL,
+                  avg_kd REAL,
+                  avg_aio REAL,
+                  volatility REAL,
+                  PRIMARY KEY (source, snapshot_date))''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS snapshot_rollups
+                 (grain TEXT,
+                  source TEXT,
+                  period_start DATE,
+                  snapshots INTEGER,
+                  keywords REAL,
+                  top3 REAL,
+                  top10 REAL,
+                  top100 REAL,
+                  total_volume REAL,
+                  avg_kd REAL,
+                  avg_aio REAL,
+                  volatility REAL,
+                  PRIMARY KEY (grain, source, period_start))''')
+    if fresh:
+        # Summarize imports saved before snapshot tracking existed
+        days = conn.execute("SELECT DISTINCT source, snapshot_date FROM keywords ORDER BY snapshot_date").fetchall()
+        for source, day in days:
+            record_snapshot(conn, source, day)
+
+
+def record_snapshot(conn, source, snapshot_date):
+    """Summarize the ``snapshot_date`` import of ``source`` and refresh its rollups."""
+    params = {'source': source, 'day': str(snapshot_date)}
+    # Present on that day: the version valid at it (snapshot_date <= day <= last_seen)
+    row = conn.execute('''SELECT COUNT(*),
+                                 COUNT(CASE WHEN k.snapshot_date = :day AND EXISTS
+                                       (SELECT 1 FROM keywords o WHERE o.keyword = k.keyword
+                                        AND o.source = k.source AND o.snapshot_date < :day) THEN 1 END),
+                                 COUNT(CASE WHEN position <= 3 THEN 1 END),
+                                 COUNT(CASE WHEN position <= 10 THEN 1 END),
+                                 COUNT(CASE WHEN position <= 100 THEN 1 END),
+                                 TOTAL(volume), AVG(kd), AVG(aio_score)
+                          FROM keywords k
+                          WHERE source = :source AND last_seen >= :day AND snapshot_date <= :day''', params).fetchone()
+    keywords, changed = row[0], row[1]
+    has_previous = conn.execute("SELECT 1 FROM snapshots WHERE source = :source AND snapshot_date < :day",
+                                params).fetchone()
+    # Share of the tracked set whose metrics moved since the previous import, on a 0-10 scale
+    volatility = round(10.0 * changed / keywords, 2) if has_previous and keywords else 0.0
+    conn.execute("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                 (source, params['day'], keywords, changed, *row[2:], volatility))
+
+    for grain, (start_expr, length) in ROLLUP_GRAINS.items():
+        period = conn.execute(f"SELECT {start_expr}", params).fetchone()[0]
+        conn.execute(f'''INSERT OR REPLACE INTO snapshot_rollups
+                         SELECT ?, source, ?, COUNT(*), {', '.join(f'AVG({c})' for c in STAT_COLUMNS[:-1])},
+                                MAX(volatility)
+                         FROM snapshots
+                         WHERE source = ? AND snapshot_date >= ? AND snapshot_date < date(?, ?)
+                         GROUP BY source''', (grain, period, source, period, period, length))
+
+
+# --- History Series (read by the Home and Lead Intelligence charts) ---
+def daily_series(conn, source, days=90):
+    return pd.read_sql_query('''SELECT * FROM snapshots
+                                WHERE source = ? AND snapshot_date >= date('now', ?)
+                                ORDER BY snapshot_date''', conn, params=(source, f'-{days} days'))
+
+
+def rollup_series(conn, source, grain='month', periods=12):
+    series = pd.read_sql_query('''SELECT * FROM snapshot_rollups WHERE grain = ? AND source = ?
+                                  ORDER BY period_start DESC LIMIT ?''', conn, params=(grain, source, periods))
+    return series.iloc[::-1].reset_index(drop=True)
+
+
+def decaying_keywords(conn, source, days=90, limit=10):
+    """Keywords whose current version lost volume against their version ``days`` ago.
+
+    Only versions created inside the window are scanned, which delta encoding keeps small.
+    """
+    return pd.read_sql_query('''SELECT cur.keyword AS "Keyword",
+                                       prev.snapshot_date AS "Baseline Date",
+                                       prev.volume AS "Baseline Volume",
+                                       cur.volume AS "Current Volume",
+                                       ROUND(100.0 * (cur.volume - prev.volume) / prev.volume, 1) AS "Change %",
+                                       prev.position AS "Baseline Position",
+                                       cur.position AS "Current Position"
+                                FROM latest_keywords cur
+                                JOIN keywords prev ON prev.keyword = cur.keyword AND prev.source = cur.source
+                                 AND prev.snapshot_date = (SELECT MAX(p.snapshot_date) FROM keywords p
+                                                           WHERE p.keyword = cur.keyword AND p.source = cur.source
+                                                           AND p.snapshot_date <= date('now', :window))
+                                WHERE cur.source = :source AND cur.snapshot_date > date('now', :window)
+                                  AND prev.volume > 0 AND cur.volume < prev.volume
+                                ORDER BY prev.volume - cur.volume DESC
+                                LIMIT :limit''', conn,
+                             params={'source': source, 'window': f'-{days} days', 'limit': limit})
@@ -0,0 +1,242 @@
+"""Master keyword store: schema, natural key, indexes and the upsert write path.
+
+Every import is a dated snapshot, delta-encoded: a keyword only gets a new row
+when its metrics differ from its current version; unchanged keywords just have
+``last_seen`` moved forward. A keyword's state on day D is therefore the row
+with the latest ``snapshot_date <= D``, and versions never overlap:
+
+- A new version at D closes the one it supersedes before D. A touch remembers
+  the ``last_seen`` it replaced (``prev_seen``), so a same-day corrected
+  re-save, or a keyword repeated across chunks of one streamed import, undoes
+  that day's touch instead of leaving both versions valid on D.
+- A changed row dated inside already observed history (the current version
+  was seen after D, or a newer version exists) is skipped. Backdated imports
+  only extend unchanged versions and never replace the latest one.
+"""
+from datetime import date, datetime
+
+import pandas as pd
+
+from seo_engine.aggregates import read_summary
+
+DB_PATH = 'tmu_seo_master.db'
+
+# --- Column Mappings (UI <-> Master Database) ---
+DB_COLUMN_MAP = {
+    'AI Overview': 'aio_score', 'ChatGPT': 'chatgpt_score',
+    'Gemini': 'gemini_score', 'Perplexity': 'perplexity_score',
+    'Volume': 'volume', 'Keyword Difficulty': 'kd', 'Intent': 'intent',
+    'Position': 'position', 'CPC (INR)': 'cpc', 'Market Segment': 'segment'
+}
+UI_COLUMN_MAP = {v: k for k, v in DB_COLUMN_MAP.items()}
+
+# Metric columns written on every upsert; defaults match the legacy save handler
+METRIC_DEFAULTS = {
+    'volume': 0.0, 'kd': 0.0, 'intent': 'Informational',
+    'aio_score': 20.0, 'chatgpt_score': 20.0, 'gemini_score': 20.0, 'perplexity_score': 20.0,
+    'position': None, 'cpc': 10.0, 'segment': None
+}
+# Derived labels: carried onto unchanged rows in place instead of creating a new version
+LABEL_COLUMNS = ['segment']
+DELTA_COLUMNS = [c for c in METRIC_DEFAULTS if c not in LABEL_COLUMNS]
+NATURAL_KEY = ['keyword', 'source', 'snapshot_date']
+
+# UI sort labels -> indexed columns usable as a keyset (every sort is tie-broken on id)
+SORTABLE_COLUMNS = {
+    'Volume': 'volume', 'Keyword Difficulty': 'kd', 'AI Overview': 'aio_score',
+    'Keyword': 'keyword', 'Last Updated': 'timestamp'
+}
+WRITE_COLUMNS = ['keyword'] + list(METRIC_DEFAULTS) + ['source', 'snapshot_date', 'timestamp']
+
+
+# --- Delta-encoded write path (staged per batch in a temp table) ---
+STAGE_SQL = f"INSERT INTO staged_keywords ({', '.join(WRITE_COLUMNS)}) VALUES ({', '.join('?' * len(WRITE_COLUMNS))})"
+
+# A staged row is unchanged when it matches the keyword's current version on every metric
+MARK_UNCHANGED_SQL = f'''UPDATE staged_keywords SET current_id = (
+    SELECT k.id FROM keywords k
+    WHERE k.keyword = staged_keywords.keyword AND k.source = staged_keywords.source
+      AND k.snapshot_date <= staged_keywords.snapshot_date
+    ORDER BY k.snapshot_date DESC LIMIT 1)'''
+UNCHANGED_FILTER = " AND ".join(f"k.{c} IS s.{c}" for c in DELTA_COLUMNS)
+
+SEEN_SQL = "COALESCE(k.last_seen, k.snapshot_date)"
+
+# Changed rows dated inside history the master database has already observed
+MARK_STALE_SQL = f'''UPDATE staged_keywords AS s SET stale = 1
+    FROM keywords AS k
+    WHERE k.id = s.current_id AND NOT ({UNCHANGED_FILTER})
+      AND ({SEEN_SQL} > s.snapshot_date
+           OR EXISTS (SELECT 1 FROM keywords n WHERE n.keyword = s.keyword AND n.source = s.source
+                      AND n.snapshot_date > s.snapshot_date))'''
+
+TOUCH_UNCHANGED_SQL = f'''UPDATE keywords AS k
+    SET last_seen = MAX({SEEN_SQL}, s.snapshot_date),
+        prev_seen = CASE WHEN {SEEN_SQL} < s.snapshot_date THEN {SEEN_SQL} ELSE k.prev_seen END,
+        {', '.join(f'{c} = COALESCE(s.{c}, k.{c})' for c in LABEL_COLUMNS)}
+    FROM staged_keywords AS s
+    WHERE k.id = s.current_id AND {UNCHANGED_FILTER}'''
+
+# A version superseded on a day it was already touched goes back to the last_seen before that touch
+CLOSE_SUPERSEDED_SQL = f'''UPDATE keywords AS k
+    SET last_seen = COALESCE(k.prev_seen, k.snapshot_date)
+    FROM staged_keywords AS s
+    WHERE k.id = s.current_id AND s.stale IS NULL AND k.snapshot_date < s.snapshot_date
+      AND {SEEN_SQL} >= s.snapshot_date AND NOT ({UNCHANGED_FILTER})'''
+
+INSERT_CHANGED_SQL = (
+    f"INSERT INTO keywords ({', '.join(WRITE_COLUMNS)}, last_seen) "
+    f"SELECT {', '.join('s.' + c for c in WRITE_COLUMNS)}, s.snapshot_date FROM staged_keywords s "
+    f"LEFT JOIN keywords k ON k.id = s.current_id "
+    f"WHERE s.stale IS NULL AND (k.id IS NULL OR NOT ({UNCHANGED_FILTER})) "
+    f"ON CONFLICT({', '.join(NATURAL_KEY)}) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in list(METRIC_DEFAULTS) + ['timestamp'])
+    + ", last_seen = MAX(COALESCE(keywords.last_seen, keywords.snapshot_date), excluded.last_seen)"
+)
+
+
+def to_db_frame(df, source, snapshot_date=None, timestamp=None):
+    """Rename a processed UI frame to master database columns, one row per keyword."""
+    save_df = df.rename(columns=DB_COLUMN_MAP)
+    save_df = save_df[[c for c in ['keyword'] + list(METRIC_DEFAULTS) if c in save_df.columns]].copy()
+    for c, default in METRIC_DEFAULTS.items():
+        if c not in save_df.columns:
+            save_df[c] = default
+        elif default is not None:
+            if isinstance(save_df[c].dtype, pd.CategoricalDtype):
+                save_df[c] = save_df[c].astype(object)
+            save_df[c] = save_df[c].fillna(default)
+        if save_df[c].dtype == 'float32':
+            # Widen via the shortest decimal (45.3, not 45.29999923706055) so an unchanged
+            # float32 score still matches its stored version instead of creating a new one
+            save_df[c] = save_df[c].astype(str).astype('float64')
+    save_df['keyword'] = save_df['keyword'].astype(str).str.strip()
+    save_df = save_df[save_df['keyword'] != ''].drop_duplicates('keyword', keep='last')
+    save_df['source'] = source
+    save_df['snapshot_date'] = str(snapshot_date or date.today())
+    save_df['timestamp'] = str(timestamp or datetime.now())
+    return save_df[WRITE_COLUMNS]
+
+
+def iter_rows(db_df):
+    # executemany wants plain Python scalars, not numpy types
+    return db_df.astype(object).where(db_df.notna(), None).itertuples(index=False, name=None)
+
+
+def write_rows(conn, db_df):
+    """Delta-upsert a ``to_db_frame`` batch: changed keywords get a row, unchanged ones are touched.
+
+    Returns the rows written; backdated changes to observed history are skipped.
+    """
+    conn.execute(f"""CREATE TEMP TABLE IF NOT EXISTS staged_keywords
+                     ({', '.join(WRITE_COLUMNS)}, current_id INTEGER, stale INTEGER)""")
+    conn.execute("DELETE FROM staged_keywords")
+    conn.executemany(STAGE_SQL, iter_rows(db_df))
+    conn.execute(MARK_UNCHANGED_SQL)
+    stale = conn.execute(MARK_STALE_SQL).rowcount
+    conn.execute(TOUCH_UNCHANGED_SQL)
+    conn.execute(CLOSE_SUPERSEDED_SQL)
+    conn.execute(INSERT_CHANGED_SQL)
+    conn.execute("DELETE FROM staged_keywords")
+    return len(db_df) - stale
+
+
+def upsert_keywords(conn, df, source, snapshot_date=None, timestamp=None):
+    """Save a processed frame as the ``snapshot_date`` version of ``source``. Returns the keywords written."""
+    from seo_engine.snapshots import record_snapshot
+
+    snapshot_date = str(snapshot_date or date.today())
+    db_df = to_db_frame(df, source, snapshot_date, timestamp)
+    with conn:
+        written = write_rows(conn, db_df)
+        record_snapshot(conn, source, snapshot_date)
+    return written
+
+
+def wipe_master(conn):
+    """Delete every keyword version, its snapshot history and the KPI totals in one transaction."""
+    with conn:
+        conn.execute("DELETE FROM keywords")
+        # The summary triggers net the totals to zero row by row; drop the emptied groups too
+        for table in ('keyword_summary', 'snapshots', 'snapshot_rollups'):
+            conn.execute(f"DELETE FROM {table}")
+
+
+# --- Query API (filters, sort and pagination pushed down into SQL) ---
+RANGE_FILTERS = ['min_volume', 'max_volume', 'min_kd', 'max_kd']
+
+
+def _where(filters, extra=None):
+    filters = filters or {}
+    clauses, params = [], []
+    for key, column in (('sources', 'source'), ('intents', 'intent')):
+        values = list(filters.get(key) or [])
+        if values:
+            clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+            params += values
+    for key, column, op in (('min_volume', 'volume', '>='), ('max_volume', 'volume', '<='),
+                            ('min_kd', 'kd', '>='), ('max_kd', 'kd', '<=')):
+        if filters.get(key) is not None:
+            clauses.append(f"{column} {op} ?")
+            params.append(filters[key])
+    if extra:
+        clauses.append(extra[0])
+        params += extra[1]
+    return (f" WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+
+def query_keywords(conn, filters=None, sort_by='volume', descending=True, limit=50, after=None):
+    """One page of the latest keywords matching ``filters``, using keyset pagination.
+
+    ``filters`` accepts sources, intents, min/max_volume and min/max_kd. ``after`` is the
+    cursor returned with the previous page. Returns ``(page_df, next_cursor)``; the cursor
+    is ``None`` on the last page.
+    """
+    if sort_by not in SORTABLE_COLUMNS.values():
+        raise ValueError(f"Unsupported sort column: {sort_by}")
+    direction = 'DESC' if descending else 'ASC'
+    extra = None
+    if after is not None:
+        extra = (f"({sort_by}, id) {'<' if descending else '>'} (?, ?)", list(after))
+    where, params = _where(filters, extra)
+    sql = f"SELECT * FROM latest_keywords{where} ORDER BY {sort_by} {direction}, id {direction} LIMIT ?"
+    page = pd.read_sql_query(sql, conn, params=params + [limit])
+    if len(page) < limit:
+        return page, None
+    last = page.iloc[-1]
+    value = last[sort_by].item() if hasattr(last[sort_by], 'item') else last[sort_by]
+    return page, (value, int(last['id']))
+
+
+def count_keywords(conn, filters=None):
+    """Latest keywords matching ``filters``.
+
+    Source/intent filters (or none) are a lookup in the trigger-maintained ``keyword_summary``;
+    only volume/KD ranges scan ``latest_keywords``. Cache range counts on ``data_version``.
+    """
+    filters = filters or {}
+    if all(filters.get(key) is None for key in RANGE_FILTERS):
+        return int(read_summary(conn, filters.get('sources'), filters.get('intents'))['keywords'].sum())
+    where, params = _where(filters)
+    return conn.execute(f"SELECT COUNT(*) FROM latest_keywords{where}", params).fetchone()[0]
+
+
+def data_version(conn):
+    """Changes whenever the latest keywords do: new versions raise MAX(id), every other change
+    to the latest set moves ``keyword_summary`` through its triggers."""
+    return (conn.execute("SELECT MAX(id) FROM keywords").fetchone()[0],
+            tuple(conn.execute("SELECT * FROM keyword_summary ORDER BY source, intent, segment")))
+
+
+def read_keywords(conn, filters=None):
+    """Every latest keyword matching ``filters``, in save order. Only for analytics loads."""
+    where, params = _where(filters)
+    return pd.read_sql_query(f"SELECT * FROM latest_keywords{where} ORDER BY id", conn, params=params)
+
+
+def list_sources(conn):
+    return [r[0] for r in conn.execute("SELECT DISTINCT source FROM keywords ORDER BY source")]
+
+
+def list_intents(conn):
+    return [r[0] for r in conn.execute("SELECT DISTINCT intent FROM keywords WHERE intent IS NOT NULL ORDER BY intent")]
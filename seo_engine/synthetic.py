@@ -0,0 +1,53 @@
+"""Synthetic SEMrush-style keyword exports for benchmarks.
+
+``profile`` reads the column distributions of a real export (by default the
+BCA broad-match sample): keyword token frequencies and lengths, and the
+empirical values of Intent, Volume, KD, CPC and SERP Features, including how
+often each is missing. ``synthetic_export`` draws any number of rows from that
+profile with the sample's raw headers, so the frames go through the same
+normalization, collapsing and derivation as a real upload. It is seeded, so a
+given size always produces the same rows.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                           'sample data', 'bca_broad-match_in_2025-08-07.csv')
+VALUE_COLUMNS = ['Intent', 'Volume', 'Keyword Difficulty', 'CPC (INR)', 'SERP Features']
+
+_profiles = {}
+
+
+def profile(path=SAMPLE_PATH):
+    """Token and column distributions of the export at ``path`` (memoized per path)."""
+    if path not in _profiles:
+        sample = pd.read_csv(path)
+        tokens = sample['Keyword'].astype(str).str.casefold().str.split()
+        vocabulary = tokens.explode().value_counts()
+        lengths = tokens.str.len().value_counts(normalize=True).sort_index()
+        _profiles[path] = {
+            'vocabulary': vocabulary.index.to_numpy(dtype=object),
+            'token_p': (vocabulary / vocabulary.sum()).to_numpy(),
+            'lengths': lengths.index.to_numpy(),
+            'length_p': lengths.to_numpy(),
+            # Raw values, NaN included, so missing rates carry over as-is
+            'values': {c: sample[c].to_numpy() for c in VALUE_COLUMNS if c in sample.columns},
+        }
+    return _profiles[path]
+
+
+def synthetic_export(rows, seed=0, path=SAMPLE_PATH):
+    """``rows`` raw export rows drawn from the profile of ``path``."""
+    spec = profile(path)
+    rng = np.random.default_rng(seed)
+    lengths = rng.choice(spec['lengths'], size=rows, p=spec['length_p'])
+    width = int(lengths.max()) if rows else 0
+    words = rng.choice(spec['vocabulary'], size=(rows, width), p=spec['token_p'])
+    keywords = [' '.join(row[:n]) for row, n in zip(words, lengths)]
+
+    df = pd.DataFrame({'Keyword': keywords})
+    for column, values in spec['values'].items():
+        df[column] = values[rng.integers(0, len(values), size=rows)]
+    return df
@@ -0,0 +1,81 @@
+import hashlib
+import os
+
+import pandas as pd
+import pytest
+
+from seo_engine.canonical import canonical_form, collapse_variants, near_duplicate_groups
+from seo_engine.importer import read_normalized
+from seo_engine.processing import normalize_seo_frame
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'sample data',
+                      'bca_broad-match_in_2025-08-07.csv')
+# sha1 of the sample's typo groups, one sorted group per line
+DIGEST = 'e6d83784d2c32ac586a191ce4632439ec18463d0'
+
+
+@pytest.fixture(scope='module')
+def sample():
+    return normalize_seo_frame(read_normalized(SAMPLE))
+
+
+@pytest.fixture(scope='module')
+def typo_groups(sample):
+    _, keys = pd.factorize(canonical_form(sample['keyword']))
+    groups = pd.Series(list(keys)).groupby(near_duplicate_groups(keys)).agg(sorted)
+    return groups[groups.str.len() > 1]
+
+
+def test_sample_merge_groups_are_pinned(sample, typo_groups):
+    collapsed = collapse_variants(sample)
+    assert len(sample) == 30_003
+    assert len(collapsed) == 25_366
+    assert collapsed['Volume'].sum() == sample['Volume'].sum()
+    assert collapsed['Variants'].sum() == len(sample)
+    assert len(typo_groups) == 491
+    assert typo_groups.str.len().sum() == 1_013
+    # Any change to the merge rules shows up here; review the new groups before updating the digest
+    listing = '\n'.join(sorted(' | '.join(group) for group in typo_groups))
+    assert hashlib.sha1(listing.encode()).hexdigest() == DIGEST
+
+
+@pytest.mark.parametrize('a, b', [
+    ('bca college delhi', 'bca college ipu'),
+    ('bca college delhi', 'bca college du'),
+    ('bca college delhi', 'bca college mca'),
+    ('bca course details', 'bca course mca'),
+    ('bca course details', 'bca course gu'),
+    ('bca entrance exam', 'au bca entrance exam'),
+    ('bca computer science', 'bca vs computer science'),
+    ('bca college kolkata', 'bca college pdf'),
+    ('what is bca', 'bca'),
+    ('bca college kanpur', 'bca college kannur'),
+    ('punjab university bca', 'punjabi university bca'),
+    ('btech fees', 'mtech fees'),
+    ('bca 2024', 'bca 2025'),
+])
+def test_distinct_queries_stay_apart(a, b):
+    _, keys = pd.factorize(canonical_form(pd.Series([a, b])))
+    assert len(keys) == 2
+    groups = near_duplicate_groups(keys)
+    assert groups[0] != groups[1]
+
+
+@pytest.mark.parametrize('a, b', [
+    ('bca college in dehli', 'bca college delhi'),
+    ('bca addmission', 'BCA Admission'),
+    ('bca syllabus pdf', 'bca sylabus pdf'),
+    ('bca question paper', 'bca question papers'),
+    ('full form of bca', 'bca fullform'),
+])
+def test_typo_variants_merge(a, b):
+    _, keys = pd.factorize(canonical_form(pd.Series([a, b])))
+    assert len(set(near_duplicate_groups(keys))) == 1
+
+
+
+def test_sources_never_merge():
+    df = pd.DataFrame({'keyword': ['bca fees', 'BCA fees', 'bca fees'], 'Volume': [100, 40, 70],
+                       'source': ['Main', 'Main', 'Medical']})
+    collapsed = collapse_variants(df)
+    assert sorted(zip(collapsed['source'], collapsed['Volume'])) == [('Main', 140), ('Medical', 70)]
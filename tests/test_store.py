@@ -0,0 +1,132 @@
+import io
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from seo_engine.aggregates import MEASURES
+from seo_engine.importer import relabel_segments, stream_import
+from seo_engine.migrations import migrate
+from seo_engine.segmentation import fit
+from seo_engine.store import _where, count_keywords, data_version, upsert_keywords
+
+SOURCE = 'bca'
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    migrate(conn)
+    yield conn
+    conn.close()
+
+
+def frame(**volumes):
+    return pd.DataFrame({'keyword': list(volumes), 'Volume': list(volumes.values()), 'Keyword Difficulty': 40})
+
+
+def snapshot(conn, day):
+    return conn.execute("SELECT keywords, total_volume FROM snapshots WHERE source = ? AND snapshot_date = ?",
+                        (SOURCE, day)).fetchone()
+
+
+def latest(conn):
+    return dict(conn.execute("SELECT keyword, volume FROM latest_keywords WHERE source = ?", (SOURCE,)).fetchall())
+
+
+def assert_summary_matches_latest(conn):
+    summary = conn.execute(f"""SELECT source, intent, segment, {', '.join(MEASURES)} FROM keyword_summary
+                               WHERE keywords != 0 ORDER BY 1, 2, 3""").fetchall()
+    expected = conn.execute("""SELECT source, COALESCE(intent, ''), COALESCE(segment, ''), COUNT(*),
+                                      TOTAL(volume), TOTAL(kd), TOTAL(cpc), TOTAL(kd > 80), TOTAL(volume > 5000)
+                               FROM latest_keywords GROUP BY 1, 2, 3 ORDER BY 1, 2, 3""").fetchall()
+    assert summary == expected
+
+
+def test_unchanged_resave_only_touches(conn):
+    upsert_keywords(conn, frame(a=10, b=20), SOURCE, '2026-01-01')
+    upsert_keywords(conn, frame(a=10, b=20), SOURCE, '2026-01-05')
+    assert conn.execute("SELECT COUNT(*) FROM keywords").fetchone()[0] == 2
+    assert snapshot(conn, '2026-01-05') == (2, 30)
+    assert_summary_matches_latest(conn)
+
+
+def test_same_day_correction_supersedes_the_touch(conn):
+    upsert_keywords(conn, frame(a=10, b=20), SOURCE, '2026-01-01')
+    upsert_keywords(conn, frame(a=10, b=20), SOURCE, '2026-01-05')
+    upsert_keywords(conn, frame(a=11, b=20), SOURCE, '2026-01-05')
+    assert snapshot(conn, '2026-01-05') == (2, 31)
+    assert snapshot(conn, '2026-01-01') == (2, 30)
+    assert conn.execute("""SELECT last_seen FROM keywords
+                           WHERE keyword = 'a' AND snapshot_date = '2026-01-01'""").fetchone() == ('2026-01-01',)
+    assert latest(conn) == {'a': 11, 'b': 20}
+    assert_summary_matches_latest(conn)
+
+
+def test_keyword_repeated_across_chunks(conn):
+    header = b"Keyword,Volume,Keyword Difficulty\n"
+    stream_import(conn, io.BytesIO(header + b"a,10,40\nb,20,40\n"), SOURCE, snapshot_date='2026-01-01')
+    export = io.BytesIO(header + b"a,10,40\nb,20,40\na,11,40\n")
+    stream_import(conn, export, SOURCE, chunksize=1, snapshot_date='2026-01-05')
+    assert snapshot(conn, '2026-01-05') == (2, 31)
+    assert latest(conn) == {'a': 11, 'b': 20}
+    assert_summary_matches_latest(conn)
+
+
+def test_backdated_change_never_becomes_latest(conn):
+    upsert_keywords(conn, frame(c=30), SOURCE, '2026-01-01')
+    upsert_keywords(conn, frame(c=30), SOURCE, '2026-01-05')
+    assert upsert_keywords(conn, frame(c=999, d=5), SOURCE, '2026-01-03') == 1
+    assert latest(conn) == {'c': 30, 'd': 5}
+    assert snapshot(conn, '2026-01-05') == (1, 30)
+    assert_summary_matches_latest(conn)
+
+
+def test_backdated_change_before_a_newer_version(conn):
+    upsert_keywords(conn, frame(c=30), SOURCE, '2026-01-01')
+    upsert_keywords(conn, frame(c=40), SOURCE, '2026-01-05')
+    assert upsert_keywords(conn, frame(c=999), SOURCE, '2026-01-03') == 0
+    assert latest(conn) == {'c': 40}
+    assert conn.execute("SELECT COUNT(*) FROM keywords").fetchone()[0] == 2
+    assert_summary_matches_latest(conn)
+
+
+def test_summary_follows_deletes(conn):
+    upsert_keywords(conn, frame(a=10, b=20), SOURCE, '2026-01-01')
+    upsert_keywords(conn, frame(a=6000, b=20), SOURCE, '2026-01-05')
+    with conn:
+        conn.execute("DELETE FROM keywords WHERE keyword = 'a' AND snapshot_date = '2026-01-05'")
+    assert latest(conn) == {'a': 10, 'b': 20}
+    assert_summary_matches_latest(conn)
+
+
+def test_relabel_backfills_segments_once_per_model(conn):
+    volumes = {f'kw{i}': 10 * i for i in range(1, 13)}
+    upsert_keywords(conn, frame(**volumes), SOURCE, '2026-01-01')
+    assert conn.execute("SELECT COUNT(*) FROM keywords WHERE segment IS NULL").fetchone()[0] == 12
+    model = fit(frame(**volumes))
+    assert relabel_segments(conn, model) == 12
+    assert conn.execute("SELECT COUNT(*) FROM keywords WHERE segment IS NULL").fetchone()[0] == 0
+    assert relabel_segments(conn, model) == 0
+    assert_summary_matches_latest(conn)
+
+
+@pytest.mark.parametrize('filters', [
+    None, {'sources': [SOURCE]}, {'intents': ['Informational']}, {'sources': ['other']},
+    {'sources': [SOURCE], 'min_volume': 15}, {'max_kd': 30},
+])
+def test_count_keywords_matches_latest(conn, filters):
+    upsert_keywords(conn, frame(a=10, b=20), SOURCE, '2026-01-01')
+    upsert_keywords(conn, frame(a=11, c=30), SOURCE, '2026-01-05')
+    where, params = _where(filters)
+    assert count_keywords(conn, filters) == conn.execute(f"SELECT COUNT(*) FROM latest_keywords{where}",
+                                                         params).fetchone()[0]
+
+
+def test_data_version_tracks_latest_changes(conn):
+    upsert_keywords(conn, frame(a=10), SOURCE, '2026-01-01')
+    before = data_version(conn)
+    upsert_keywords(conn, frame(a=10), SOURCE, '2026-01-05')
+    assert data_version(conn) == before
+    upsert_keywords(conn, frame(a=12), SOURCE, '2026-01-05')
+    assert data_version(conn) != before